@@ -0,0 +1,391 @@
+""" benchmarks for hookedup. Each benchmark produces result records that are written as JSON (to
+stdout, or to --output), with a readable summary on stderr. By default the operations benchmark
+runs, which times hookedup.List against list for every hooked operation, across list sizes and
+hook setups:
+python bench.py
+python bench.py operations --sizes 10 1000 --operations append extend --hooks none abort
+python bench.py --operations append extend --hooks abort return_abort  # raising vs returning
+python bench.py membership owners setattr array memory pickle parallel
+Save a run with --output and pass it to a later run as --baseline to report every result that got
+slower than threshold times its baseline (exit status 1 if there are any):
+python bench.py --output before.json
+python bench.py --baseline before.json --threshold 1.25
+"""
+import argparse
+import array
+import concurrent.futures
+import gc
+import hashlib
+import json
+import operator
+import os
+import pickle
+import sys
+import timeit
+import tracemalloc
+import hookedup
+
+SIZES = (10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6)
+MEASUREMENTS = ('seconds', 'blocks', 'bytes')  # result fields that are measured, not parameters
+
+
+def best_time(fxn, number, repeat=5):
+    """ Returns: fastest time in seconds of a single fxn() call, out of repeat runs of number calls
+    """
+    return min(timeit.repeat(fxn, number=number, repeat=repeat)) / number
+
+
+def noop(*_):
+    pass
+
+
+def abort_every_4th(lst, item, *_):
+    """ pre hook that aborts items divisible by 4 (a quarter of the items in these benchmarks) """
+    if item % 4 == 0:
+        raise hookedup.Abort()
+
+
+def return_abort_every_4th(lst, item, *_):
+    """ abort_every_4th, aborting by returning hookedup.ABORT instead of raising Abort """
+    if item % 4 == 0:
+        return hookedup.ABORT
+
+
+HOOK_SETUPS = {
+    'none': {},
+    'noop': {hook_name: noop for hook_name in ('pre_add', 'pre_remove', 'pre_replace',
+                                               'post_add', 'post_remove', 'post_replace')},
+    'abort': {'pre_add': abort_every_4th, 'pre_remove': abort_every_4th,
+              'pre_replace': abort_every_4th, 'post_add': noop, 'post_remove': noop,
+              'post_replace': noop},
+    'return_abort': {'pre_add': return_abort_every_4th, 'pre_remove': return_abort_every_4th,
+                     'pre_replace': return_abort_every_4th, 'post_add': noop,
+                     'post_remove': noop, 'post_replace': noop},
+}
+
+
+def _append(container, size):
+    append = container.append
+    for item in range(size):
+        append(item)
+
+
+def _insert(container, size):
+    for item in range(min(size, 100)):
+        container.insert(len(container) // 2, item)
+
+
+def _pop(container, size):
+    for _ in range(min(size, 100)):
+        container.pop()
+
+
+def _remove(container, size):
+    for item in range(size // 2, size // 2 + min(size // 2, 100)):
+        container.remove(item)
+
+
+def _set_slice(container, size):
+    container[size // 4:size // 2] = range(size // 8)
+
+
+def _del_slice(container, size):
+    del container[size // 4:3 * size // 4]
+
+
+def _imul(container, size):
+    container *= 2
+
+
+# operation name: (whether it starts from a full list of the given size, fxn(container, size))
+OPERATIONS = {
+    'append': (False, _append),
+    'extend': (False, lambda container, size: container.extend(range(size))),
+    'insert': (True, _insert),
+    'pop': (True, _pop),
+    'remove': (True, _remove),
+    'clear': (True, lambda container, size: container.clear()),
+    'set_slice': (True, _set_slice),
+    'del_slice': (True, _del_slice),
+    'imul': (True, _imul),
+}
+
+
+def time_operation(operation, size, make_container, repeat):
+    """ time one operation on fresh containers of the given size. Containers are built before
+    each timed run, so only the operation itself is measured.
+    Returns: fastest time in seconds of a single operation
+    """
+    starts_full, fxn = OPERATIONS[operation]
+    initial = list(range(size)) if starts_full else []
+    number = max(1, min(1000, 10 ** 5 // size))
+    timer = timeit.default_timer
+    best = None
+    for _ in range(repeat):
+        containers = [make_container(initial) for _ in range(number)]
+        start = timer()
+        for container in containers:
+            fxn(container, size)
+        elapsed = (timer() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_operations(options):
+    """ time each operation on list, then on hookedup.List under each hook setup """
+    for operation in options.operations:
+        for size in options.sizes:
+            yield {'benchmark': 'operations', 'operation': operation, 'size': size,
+                   'container': 'list', 'hooks': 'none',
+                   'seconds': time_operation(operation, size, list, options.repeat)}
+            for setup in options.hooks:
+                hooks = HOOK_SETUPS[setup]
+                make = lambda initial: hookedup.List(initial, **hooks)
+                yield {'benchmark': 'operations', 'operation': operation, 'size': size,
+                       'container': 'List', 'hooks': setup,
+                       'seconds': time_operation(operation, size, make, options.repeat)}
+
+
+def bench_membership(options):
+    """ the README's membership pattern: test whether a member is in a club, then move it out and
+    back in (remove + append). Compares list, hookedup.List and hookedup.List(indexed=True)
+    """
+    for size in options.sizes:
+        member = size // 2
+        for name, make in [('list', list),
+                           ('List', lambda items: hookedup.List(items, pre_add=noop)),
+                           ('List indexed', lambda items: hookedup.List(items, pre_add=noop,
+                                                                         indexed=True))]:
+            club = make(range(size))
+            def move():
+                club.remove(member)
+                club.append(member)
+            yield {'benchmark': 'membership', 'operation': 'in', 'size': size, 'container': name,
+                   'seconds': best_time(lambda: -1 in club, number=20, repeat=options.repeat)}
+            yield {'benchmark': 'membership', 'operation': 'remove+append', 'size': size,
+                   'container': name, 'seconds': best_time(move, number=20, repeat=options.repeat)}
+
+
+def bench_owners(options):
+    """ create and drop as many owners of a PreventOverwriteProperty list as the largest size,
+    reporting how many allocated blocks outlive them, then time repeated access to one owner's list
+    """
+    class Owner:
+        members = hookedup.PreventOverwriteProperty()
+    count = max(options.sizes)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for i in range(count):
+        Owner().members.append(i)
+    gc.collect()
+    yield {'benchmark': 'owners', 'operation': 'create and drop', 'size': count,
+           'blocks': sys.getallocatedblocks() - blocks}
+    owner = Owner()
+    yield {'benchmark': 'owners', 'operation': 'access',
+           'seconds': best_time(lambda: owner.members, number=100000, repeat=options.repeat)}
+
+
+def bench_setattr(options):
+    """ assign attributes on a plain object and on a PreventHookedupOverwriteReset subclass
+    instance that also holds a hookedup List: a counter that already exists, and three new
+    attributes on a fresh instance (as __init__ would)
+    """
+    class Plain:
+        pass
+    class Guarded(hookedup.PreventHookedupOverwriteReset):
+        pass
+    for name, cls in [('object', Plain), ('PreventHookedupOverwriteReset', Guarded)]:
+        model = cls()
+        model.members = hookedup.List()
+        model.counter = 0
+        def assign():
+            model.counter = 1
+        def construct():
+            fresh = cls()
+            fresh.a = fresh.b = fresh.c = 0
+        yield {'benchmark': 'setattr', 'operation': 'existing attribute', 'container': name,
+               'seconds': best_time(assign, number=100000, repeat=options.repeat)}
+        yield {'benchmark': 'setattr', 'operation': 'new instance with 3 attributes',
+               'container': name,
+               'seconds': best_time(construct, number=100000, repeat=options.repeat)}
+
+
+def bench_array(options):
+    """ extend an empty container by the largest size of floats that a validation hook checks
+    for being non-negative: list, hookedup.List with pre_add, and hookedup.Array with a
+    pre_add_many that checks the whole buffer at once
+    """
+    size = max(options.sizes)
+    samples = array.array('d', range(size))
+    def check_item(lst, item):
+        if item < 0:
+            raise hookedup.Abort()
+    def check_buffer(arr, view):
+        return None if min(view, default=0) >= 0 else [x >= 0 for x in view]
+    for name, make, items in [('list', list, list(samples)),
+                              ('List', lambda: hookedup.List(pre_add=check_item), list(samples)),
+                              ('Array', lambda: hookedup.Array('d', pre_add_many=check_buffer),
+                               samples)]:
+        def extend():
+            make().extend(items)
+        yield {'benchmark': 'array', 'operation': 'extend', 'size': size, 'container': name,
+               'seconds': best_time(extend, number=1, repeat=options.repeat)}
+
+
+def bench_memory(options):
+    """ keep as many small containers alive as the largest size (10^6 by default), all created
+    from the same hooks, as with the README's **callback, and report the memory traced per
+    container, plus the time to create one
+    """
+    count = max(options.sizes)
+    callback = {'pre_add': noop, 'pre_remove': noop, 'post_add': noop}
+    for name, make in [('list', lambda: [0]), ('List', lambda: hookedup.List([0])),
+                       ('List with hooks', lambda: hookedup.List([0], **callback)),
+                       ('Set with hooks', lambda: hookedup.Set([0], **callback))]:
+        gc.collect()
+        tracemalloc.start()
+        containers = [make() for _ in range(count)]
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del containers
+        yield {'benchmark': 'memory', 'operation': 'keep alive', 'size': count, 'container': name,
+               'bytes': traced // count,
+               'seconds': best_time(make, number=10000, repeat=options.repeat)}
+
+
+def pickle_round_trip(container):
+    """ pickle container with protocol 5, handing buffers out of band, and unpickle it """
+    buffers = []
+    data = pickle.dumps(container, protocol=5, buffer_callback=buffers.append)
+    return pickle.loads(data, buffers=buffers)
+
+
+def bench_pickle(options):
+    """ pickle and unpickle a container of the largest size, in this process and by sending it to
+    a worker process and back: list, hookedup.List with a hook, and hookedup.Array
+    """
+    size = max(options.sizes)
+    containers = [('list', list(range(size))),
+                  ('List', hookedup.List(range(size), pre_add=operator.is_)),
+                  ('Array', hookedup.Array('d', range(size), pre_add=operator.is_))]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+        for name, container in containers:
+            transfer = lambda: pool.submit(operator.iadd, container, container[:0]).result()
+            yield {'benchmark': 'pickle', 'operation': 'dumps+loads', 'size': size,
+                   'container': name, 'seconds': best_time(lambda: pickle_round_trip(container),
+                                                           number=1, repeat=options.repeat)}
+            yield {'benchmark': 'pickle', 'operation': 'process pool round trip', 'size': size,
+                   'container': name,
+                   'seconds': best_time(transfer, number=1, repeat=options.repeat)}
+
+
+@hookedup.pure
+def check_digest(lst, item):
+    """ CPU heavy pure pre_add hook: hash the item a few times, rejecting 1 in 16 items """
+    digest = str(item).encode()
+    for _ in range(20):
+        digest = hashlib.sha256(digest).digest()
+    if digest[0] < 16:
+        return hookedup.ABORT
+
+
+def bench_parallel(options):
+    """ extend a List by the largest size of items with a CPU heavy pure pre_add hook: serially,
+    then validating in parallel on a process pool of 1, 2, 4, ... up to os.cpu_count() workers
+    """
+    size = max(options.sizes)
+    items = list(range(size))
+    workers = [None]
+    while (workers[-1] or 0) < (os.cpu_count() or 1):
+        workers.append(2 * workers[-1] if workers[-1] else 1)
+    for count in workers:
+        pool = None if count is None else concurrent.futures.ProcessPoolExecutor(count)
+        def extend():
+            L = hookedup.List(pre_add=check_digest)
+            L.validate_in_parallel(pool, chunk_size=max(1000, size // (8 * (count or 1))))
+            L.extend(items)
+        yield {'benchmark': 'parallel', 'operation': 'extend', 'size': size,
+               'workers': count or 0,
+               'seconds': best_time(extend, number=1, repeat=options.repeat)}
+        if pool is not None:
+            pool.shutdown()
+
+
+BENCHMARKS = {'operations': bench_operations, 'membership': bench_membership,
+              'owners': bench_owners, 'setattr': bench_setattr, 'array': bench_array,
+              'memory': bench_memory, 'pickle': bench_pickle, 'parallel': bench_parallel}
+
+
+def result_key(result):
+    """ Returns: hashable identity of a result: every field that is not a measurement """
+    return tuple(sorted((field, value) for field, value in result.items()
+                        if field not in MEASUREMENTS))
+
+
+def describe(result):
+    """ Returns: one readable line summarizing result """
+    params = ' '.join(str(value) for field, value in result.items() if field not in MEASUREMENTS)
+    measured = ['{}={:.3e}'.format(field, result[field]) if field == 'seconds' else
+                '{}={}'.format(field, result[field]) for field in MEASUREMENTS if field in result]
+    return params + '  ' + '  '.join(measured)
+
+
+def find_regressions(results, baseline, threshold):
+    """ Returns: list of (result, baseline_result) pairs where result took more than threshold
+    times as many seconds as the baseline result with the same parameters
+    """
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before and 'seconds' in result and result['seconds'] > threshold * before['seconds']:
+            regressions.append((result, before))
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='benchmarks for hookedup')
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help='any of: ' + ', '.join(BENCHMARKS) + ' (default: operations)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--operations', nargs='+', choices=list(OPERATIONS),
+                        default=list(OPERATIONS))
+    parser.add_argument('--hooks', nargs='+', choices=list(HOOK_SETUPS),
+                        default=list(HOOK_SETUPS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown factor, relative to --baseline, that counts as a regression')
+    options = parser.parse_args(argv)
+    unknown = set(options.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmarks: ' + ', '.join(sorted(unknown)))
+    return options
+
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    results = []
+    for name in options.benchmarks or ['operations']:
+        for result in BENCHMARKS[name](options):
+            print(describe(result), file=sys.stderr)
+            results.append(result)
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump(results, output, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    if options.baseline:
+        with open(options.baseline) as baseline:
+            regressions = find_regressions(results, json.load(baseline), options.threshold)
+        for result, before in regressions:
+            print('REGRESSION: {} (baseline {:.3e}s)'.format(describe(result), before['seconds']),
+                  file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
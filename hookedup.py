@@ -1,70 +1,569 @@
+import array
+import asyncio
 import collections
+import collections.abc
+import contextlib
+import copy
+import functools
+import inspect
+import itertools
+import pickle
+import threading
+import time
 import warnings
+import weakref
 
 class Abort(Exception):
-    """ raise this when aborting an action. Must be raised during the pre-action hook call """
+    """ raise this when aborting an action. Must be raised during the pre-action hook call (or
+    return ABORT from it instead)
+    """
     pass
 
 
-class List(list):
-    """ A list that can call pre- and post- hook functions for the add, remove, and replace
-    operations. If the Abort exception is raised in any pre- hook call, the corresponding action
-    will not take place, and will not trigger the post- hook call either.
+class _AbortType:
+    """ type of ABORT, a pre hook's return value that aborts the action like raising Abort, but
+    without the cost of raising and catching an exception
     """
+    __slots__ = ()
 
-    def __init__(self, *args, **kwargs):
-        """ init a list, with an optional "hook" keyword argument that supplies a dictionary
-        mapping a pre-action and post-action keyword to a function
+    def __repr__(self):
+        return 'hookedup.ABORT'
+
+    def __reduce__(self):
+        return 'ABORT'
+
+
+ABORT = _AbortType()  # return this from a pre hook to abort the action
+
+
+HOOK_NAMES = ('pre_add', 'pre_remove', 'pre_replace', 'post_add', 'post_remove', 'post_replace',
+              'pre_add_many', 'post_add_many', 'pre_move', 'post_move')
+
+
+class _HookRecord:
+    """ call statistics of one hook (see HookStats) """
+    __slots__ = ('calls', 'aborts', 'sampled', 'total_seconds', 'max_seconds')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = self.aborts = self.sampled = 0
+        self.total_seconds = self.max_seconds = 0.0
+
+    def snapshot(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class HookStats:
+    """ per hook name call counts, abort counts, and cumulative and maximum wall time of the hooks
+    of every List instrumented with it (see List.enable_hook_stats and enable_hook_stats). Calls
+    and aborts are always counted; only every sample_every-th call of each hook is timed, so
+    total_seconds covers the "sampled" calls only.
+    """
+
+    def __init__(self, sample_every=1):
+        self.sample_every = sample_every
+        self._records = collections.defaultdict(_HookRecord)
+
+    def snapshot(self):
+        """ Returns: dictionary mapping each called hook name to a dictionary of its statistics """
+        return {hook_name: record.snapshot() for hook_name, record in self._records.items()}
+
+    def reset(self):
+        """ zero all statistics. Instrumented lists keep recording into this object """
+        for record in self._records.values():
+            record.reset()
+
+    def wrap(self, hook_name, hook):
+        """ Returns: function that calls hook and records the call under hook_name """
+        record = self._records[hook_name]
+        sample_every = self.sample_every
+        clock = time.perf_counter
+
+        def instrumented(*args):
+            record.calls += 1
+            if record.calls % sample_every:
+                try:
+                    result = hook(*args)
+                except Abort:
+                    record.aborts += 1
+                    raise
+                if result is ABORT:
+                    record.aborts += 1
+                return result
+            start = clock()
+            try:
+                result = hook(*args)
+            except Abort:
+                record.aborts += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                record.sampled += 1
+                record.total_seconds += elapsed
+                if elapsed > record.max_seconds:
+                    record.max_seconds = elapsed
+            if result is ABORT:
+                record.aborts += 1
+            return result
+
+        return instrumented
+
+    def wrap_async(self, hook_name, hook):
+        """ Returns: coroutine function that calls hook, awaits its result if it is awaitable, and
+        records the call under hook_name. Sampled calls are timed until the await completes
         """
-        keywords = set(['pre_add', 'pre_remove', 'pre_replace', 
-                        'post_add', 'post_remove', 'post_replace'])
-        super().__init__(*args)
-        empty_func = lambda: lambda *_, **__: None
-        self._hook = collections.defaultdict(empty_func)
-        self._abort_stats = collections.defaultdict(int)
-        self._hook.update(kwargs)
-        unrecognized = set(kwargs.keys()) - keywords
-        if unrecognized:
-            warnings.warn('unrecognized keywords passed to hookedup.List: ' + str(unrecognized))
+        record = self._records[hook_name]
+        sample_every = self.sample_every
+        clock = time.perf_counter
 
-    def clear(self):
-        """ remove items from list individually, starting at index 0. Call pre and post_remove
-        functions for each item and do not remove item if pre_remove raises Abort.
+        async def instrumented(*args):
+            record.calls += 1
+            timed = not record.calls % sample_every
+            start = clock() if timed else 0.0
+            try:
+                result = hook(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Abort:
+                record.aborts += 1
+                raise
+            finally:
+                if timed:
+                    elapsed = clock() - start
+                    record.sampled += 1
+                    record.total_seconds += elapsed
+                    if elapsed > record.max_seconds:
+                        record.max_seconds = elapsed
+            if result is ABORT:
+                record.aborts += 1
+            return result
+
+        return instrumented
+
+
+_global_hook_stats = None  # HookStats that new Lists record into, if set by enable_hook_stats()
+
+
+def enable_hook_stats(sample_every=1):
+    """ instrument the hooks of every List created (or given new hooks) from now on, recording
+    into one shared HookStats. Lists that already exist are not affected.
+    Returns: the shared HookStats
+    """
+    global _global_hook_stats
+    _global_hook_stats = HookStats(sample_every)
+    return _global_hook_stats
+
+
+def disable_hook_stats():
+    """ stop instrumenting the hooks of Lists created from now on """
+    global _global_hook_stats
+    _global_hook_stats = None
+
+
+class _CompiledHooks:
+    """ the hooks installed on a List, resolved once when they are installed. Each absent hook is
+    stored as None, and the adds / removes / replaces flags tell a mutator with one attribute
+    lookup whether it must run the hooked path or can fall straight through to the native list
+    method. A tracked list (one whose changes are reported to trackers) takes the hooked path for
+    every operation. If stats (a HookStats) is given, each hook is wrapped to record its calls;
+    otherwise hooks are called directly, at no extra cost. post_wrappers are functions that each
+    take a post hook and return a replacement for it (for example one that defers the call);
+    they are applied to every post hook in order.
+    Compiled hooks are shared between containers (see _hook_profile), so they are never changed
+    after construction.
+    """
+    __slots__ = HOOK_NAMES + ('hooks', 'adds', 'removes', 'replaces', 'batch_adds', 'tracked',
+                              '__weakref__')
+
+    def __init__(self, hooks, tracked=False, stats=None, post_wrappers=()):
+        self.hooks = hooks  # only the installed hooks, keyed by hook name
+        for hook_name in HOOK_NAMES:
+            hook = hooks.get(hook_name)
+            if hook is not None and stats is not None:
+                hook = stats.wrap(hook_name, hook)
+            if hook is not None and hook_name.startswith('post_'):
+                for wrap in post_wrappers:
+                    hook = wrap(hook)
+            setattr(self, hook_name, hook)
+        self.tracked = tracked
+        self.batch_adds = self.pre_add_many is not None or self.post_add_many is not None
+        self.adds = (tracked or self.batch_adds or self.pre_add is not None or
+                     self.post_add is not None)
+        self.removes = tracked or self.pre_remove is not None or self.post_remove is not None
+        self.replaces = tracked or self.pre_replace is not None or self.post_replace is not None
+
+
+_hook_profiles = weakref.WeakValueDictionary()  # interned _CompiledHooks, see _hook_profile
+_recent_hook_profiles = collections.deque(maxlen=64)
+
+
+def _hook_profile(hooks, tracked=False, stats=None, post_wrappers=()):
+    """ Returns: _CompiledHooks for the given configuration. Configurations without post_wrappers
+    are interned by the identity of their hooks: every container installing the same hook objects
+    (like the many lists created from one **callback dictionary) shares one profile, which is
+    dropped once no container uses it. Hooks that are distinct objects get distinct profiles, even
+    if they compare equal. The most recently built profiles are kept a while longer, so that
+    creating and dropping short-lived containers does not rebuild them each time. Only profiles
+    whose hooks are all plain functions without closures are kept that way: a bound method,
+    closure or functools.partial hook could keep the object it refers to alive.
+    """
+    if post_wrappers:
+        return _CompiledHooks(hooks, tracked, stats, post_wrappers)
+    key = (frozenset((hook_name, id(hook)) for hook_name, hook in hooks.items()), tracked, stats)
+    try:
+        return _hook_profiles[key]
+    except KeyError:
+        # the profile keeps its hooks alive, so no other object can take their ids while it is used
+        profile = _hook_profiles[key] = _CompiledHooks(hooks, tracked, stats)
+        if all(inspect.isfunction(hook) and hook.__closure__ is None for hook in hooks.values()):
+            _recent_hook_profiles.append(profile)
+        return profile
+
+
+_nothing_held = contextlib.nullcontext()  # what List._one_operation returns without subscriptions
+
+
+class _UndoLog:
+    """ tracker (see List._add_tracker) that records, for each change of a List in a transaction,
+    the slice and items that undo it, so that rolling back costs O(changes)
+    """
+
+    def __init__(self):
+        self.entries = []  # (start, stop, items): restore lst[start:stop] = items, last first
+
+    def splice(self, lst, start, removed, added):
+        self.entries.append((start, start + len(added), removed))
+
+    def permute(self, lst, start, stop):
+        pass  # List.sort and List.reverse log the order they started from themselves
+
+
+class _Transaction:
+    """ context manager returned by List.transaction(). On entering, it starts logging how to undo
+    each change of the list and deferring post hooks. Operations inside the block run their pre
+    hooks and change the list as usual. Leaving the block normally calls the deferred post hooks
+    in order. Leaving it with an exception instead undoes the logged changes, last first, and
+    drops the deferred post hooks. A nested transaction acts as a savepoint within the outer one.
+    """
+
+    def __init__(self, lst):
+        self.lst = lst
+        self.outer = None
+        self.undo = None
+        self.undo_mark = 0
+        self.deferred = None
+        self.savepoint = 0
+        self.notifications = None
+
+    def __enter__(self):
+        lst = self.lst
+        self.outer = lst._transaction
+        lst._transaction = self
+        if self.outer is None:
+            self.undo = _UndoLog()
+            self.deferred = []
+            self.notifications = lst._one_operation()
+            self.notifications.__enter__()
+            lst._add_tracker(self.undo)
+        else:
+            self.undo = self.outer.undo
+            self.undo_mark = len(self.undo.entries)
+            self.deferred = self.outer.deferred
+            self.savepoint = len(self.deferred)
+            lst._compile_hooks(lst._installed_hooks())
+        return lst
+
+    def __exit__(self, exc_type, exc, traceback):
+        lst = self.lst
+        lst._transaction = self.outer
+        if exc_type is not None:
+            self.rollback()
+        if self.outer is None:
+            lst._remove_tracker(self.undo)
+            self.notifications.__exit__(None, None, None)
+            if exc_type is None:
+                self.call_deferred()
+        else:
+            lst._compile_hooks(lst._installed_hooks())
+        return exc_type is not None and issubclass(exc_type, Abort)
+
+    def call_deferred(self):
+        """ call every deferred post hook in order, even if some raise, since all their changes
+        are committed. Then re-raise the first exception raised
         """
-        i = 0
-        while i < len(self):
-            item = self[i]
-            if self._hook_fxn_aborts('pre_remove', item):
-                i += 1  # compensate for not removing item @ i
-            else:
-                super().__delitem__(i)
-                self._call_post_hook_fxn('post_remove', item)
+        errors = []
+        for hook, args in self.deferred:
+            try:
+                hook(*args)
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
 
-    def extend(self, items):
-        """ append items individually, calling pre and post_add functions. If pre_add function
-        raises Abort, will not add that item.
+    def defer(self, hook):
+        """ Returns: function that appends hook and its arguments to the deferred post hooks
+        instead of calling it
         """
-        if not isinstance(items, collections.Iterable):
-            obj_type = str(type(items)).replace('>', '').replace('<class ', '')
-            raise TypeError(obj_type + ' object is not iterable')
-        for item in items:
-            self.append(item)  # recursive. Will trigger pre and post hooks in append fxn
+        deferred = self.deferred
+        return lambda *args: deferred.append((hook, args))
+
+    def rollback(self):
+        """ undo the changes logged since entering, reporting each to the other trackers, and
+        forget post hooks deferred since entering
+        """
+        lst = self.lst
+        entries = self.undo.entries
+        while len(entries) > self.undo_mark:
+            start, stop, items = entries.pop()
+            removed = lst[start:stop]
+            list.__setitem__(lst, slice(start, stop), items)
+            for tracker in lst._trackers:
+                if tracker is not self.undo:
+                    tracker.splice(lst, start, removed, items)
+        if self.outer is None:
+            self.deferred.clear()
+        else:
+            del self.deferred[self.savepoint:]
+
+
+def pure(hook):
+    """ mark hook as pure: its verdict depends only on the item, not on the list, and it has no
+    side effects that matter. Pure pre_add hooks of a List that validates in parallel (see
+    List.validate_in_parallel) may run in another thread or process, where they are called with
+    None in place of the list. Use as a decorator.
+    Returns: hook
+    """
+    hook.hookedup_pure = True
+    return hook
+
+
+def _pure_verdicts(hook, items):
+    """ run hook on each of items, with None as the list (in a pool worker)
+    Returns: bytes holding 1 for each item the hook accepted and 0 for each it aborted
+    """
+    verdicts = bytearray(len(items))
+    for position, item in enumerate(items):
+        try:
+            verdicts[position] = hook(None, item) is not ABORT
+        except Abort:
+            pass
+    return bytes(verdicts)
+
+
+class _ParallelValidator:
+    """ runs a pure pre_add hook over the items of a bulk add in chunks of chunk_size, on the
+    threads or processes of a concurrent.futures executor (see List.validate_in_parallel)
+    """
+    __slots__ = ('executor', 'chunk_size')
+
+    def __init__(self, executor, chunk_size):
+        self.executor = executor
+        self.chunk_size = chunk_size
+
+    def accepted(self, hook, items):
+        """ Returns: list of the items that hook accepts, in their original order """
+        size = self.chunk_size
+        chunks = [items[start:start + size] for start in range(0, len(items), size)]
+        verdicts = self.executor.map(_pure_verdicts, itertools.repeat(hook), chunks)
+        return [item for chunk, accepts in zip(chunks, verdicts)
+                for item in itertools.compress(chunk, accepts)]
+
+
+def _restore(cls, args, kwargs):
+    """ unpickle a hooked container (see _Hooked.__reduce_ex__) """
+    return cls(*args, **kwargs)
+
+
+# instance attributes of every hooked container (see _Hooked). Containers whose builtin base does
+# not support weak references (list, dict) add '__weakref__', which their subclasses used to have
+_HOOKED_SLOTS = ('_abort_counts', '_trackers', '_transaction', 'hook_stats', '_hooks')
+
+
+class _Hooked:
+    """ the hook machinery shared by List, Set, Dict and Array: installing and compiling hooks,
+    and calling them. Subclasses call _init_hooks from __init__, after the native container is
+    filled, and list _HOOKED_SLOTS in their __slots__.
+    """
+    __slots__ = ()
+    _hook_names = HOOK_NAMES  # hooks this container calls; others are warned about and ignored
+    _hookedup_name = 'List'  # name used in warnings
+
+    def _init_hooks(self, hooks):
+        """ set up hook state and install hooks (a dictionary of hook name: function) """
+        self._abort_counts = None
+        self._trackers = ()
+        self._transaction = None
+        self.hook_stats = _global_hook_stats
+        self._hooks = _hook_profile({}, False, _global_hook_stats)
+        if hooks:
+            self.set_hooks(**hooks)
+
+    @property
+    def _abort_stats(self):
+        """ dictionary mapping hook name to how many times it aborted, created at the first abort
+        """
+        if self._abort_counts is None:
+            self._abort_counts = collections.defaultdict(int)
+        return self._abort_counts
+
+    def _installed_hooks(self):
+        """ Returns: dictionary of the installed hooks, keyed by hook name """
+        return self._hooks.hooks
+
+    def __reduce_ex__(self, protocol):
+        """ pickle the container's items and its installed hooks. Hooks are pickled by reference
+        (their importable name), so they must be module level functions or methods: pickling a
+        container with a lambda or nested function hook raises PicklingError. The unpickled
+        container is filled before its hooks are installed, so no hooks run while unpickling.
+        Trackers (journals), transactions, hook statistics and abort counts are not pickled.
+        """
+        args, kwargs, listitems, dictitems = self._pickle_contents(protocol)
+        return (_restore, (type(self), args, kwargs), self._pickled_hooks(), listitems,
+                dictitems)
+
+    def _pickle_contents(self, protocol):
+        """ Returns: (args, kwargs, listitems, dictitems) for __reduce_ex__. The container is
+        rebuilt as type(self)(*args, **kwargs), without hooks, then given listitems with extend()
+        or dictitems with item assignment
+        """
+        raise NotImplementedError
+
+    def _pickled_hooks(self):
+        """ Returns: dictionary of the installed hooks, after checking that each of them can be
+        pickled by name
+        """
+        hooks = dict(self._installed_hooks())
+        for hook_name, hook in hooks.items():
+            qualname = getattr(hook, '__qualname__', '')
+            if '<lambda>' in qualname or '<locals>' in qualname:
+                raise pickle.PicklingError(
+                    'cannot pickle hookedup.' + self._hookedup_name + ' with ' + hook_name +
+                    ' hook ' + qualname + ': hooks are pickled by importable name')
+        return hooks
+
+    def __setstate__(self, hooks):
+        """ install the unpickled hooks """
+        self.set_hooks(**hooks)
+
+    def __copy__(self):
+        return self._copy(lambda item: item)
+
+    def __deepcopy__(self, memo):
+        return self._copy(functools.partial(copy.deepcopy, memo=memo), memo)
+
+    def _copy(self, copy_item, memo=None):
+        """ Returns: container of the same type and hooks, holding the items passed through
+        copy_item. The hooks are installed after the items, so they are not called
+        """
+        args, kwargs, listitems, dictitems = self._pickle_contents(pickle.HIGHEST_PROTOCOL)
+        copied = type(self)(*[copy_item(arg) for arg in args], **kwargs)
+        if memo is not None:
+            memo[id(self)] = copied
+        if listitems is not None:
+            copied.extend([copy_item(item) for item in listitems])
+        if dictitems is not None:
+            copied.update([(copy_item(key), copy_item(value)) for key, value in dictitems])
+        copied.set_hooks(**self._installed_hooks())
+        return copied
+
+    def _compile_hooks(self, hooks):
+        """ install hooks (a dictionary of hook name: function) as this container's _CompiledHooks """
+        self._hooks = _hook_profile(hooks, bool(self._trackers), self.hook_stats,
+                                    self._post_hook_wrappers())
+
+    def _post_hook_wrappers(self):
+        """ Returns: tuple of functions that _CompiledHooks applies, in order, to each post hook """
+        if self._transaction is None:
+            return ()
+        return (self._transaction.defer,)
+
+    def enable_hook_stats(self, sample_every=1, stats=None):
+        """ record call counts, abort counts and wall time of this container's hooks into stats
+        (a new HookStats timing every sample_every-th call, if not given). Pass the same stats to
+        several containers to aggregate them.
+        Returns: the HookStats, also available as self.hook_stats
+        """
+        self.hook_stats = HookStats(sample_every) if stats is None else stats
+        self._compile_hooks(self._installed_hooks())
+        return self.hook_stats
+
+    def disable_hook_stats(self):
+        """ stop recording hook statistics; hooks are called directly again """
+        self.hook_stats = None
+        self._compile_hooks(self._installed_hooks())
+
+    def set_hooks(self, **hooks):
+        """ install or replace hooks at runtime. Passing None for a hook removes it. Hooks not
+        mentioned stay installed. Afterwards, operations without a relevant hook fall straight
+        through to the native methods again.
+        L.set_hooks(pre_add=check_item, post_remove=None)
+        """
+        unrecognized = hooks.keys() - self._hook_names
+        if unrecognized:
+            warnings.warn('unrecognized keywords passed to hookedup.' +
+                          self._hookedup_name + ': ' + str(unrecognized))
+        installed = dict(self._installed_hooks())
+        installed.update(hooks)
+        installed = {name: fxn for name, fxn in installed.items()
+                     if fxn is not None and name in self._hook_names}
+        self._compile_hooks(installed)
+
+    def _accepted_adds(self, items):
+        """ run pre_add_many once (or pre_add for each item, if there is no batch hook) on items
+        Returns: list of items accepted for adding
+        """
+        hooks = self._hooks
+        if hooks.pre_add_many is None:
+            if hooks.pre_add is None:
+                return items
+            return [item for item in items if not self._hook_fxn_aborts('pre_add', item)]
+        try:
+            accepted = hooks.pre_add_many(self, items)
+        except Abort:
+            accepted = ABORT
+        if accepted is ABORT:
+            self._abort_stats['pre_add_many'] += 1
+            return []
+        return items if accepted is None else list(accepted)
+
+    def _call_post_add_hooks(self, added):
+        """ run post_add_many once (or post_add for each item, if there is no batch hook) """
+        if self._hooks.post_add_many is not None:
+            self._call_post_hook_fxn('post_add_many', added)
+        elif self._hooks.post_add is not None:
+            for item in added:
+                self._call_post_hook_fxn('post_add', item)
 
     def _call_post_hook_fxn(self, hook_name, *args):
-        """ run the named hook with supplied arguments """
-        self._hook[hook_name](self, *args)
+        """ run the named hook with supplied arguments, if it is installed """
+        hook = getattr(self._hooks, hook_name)
+        if hook is not None:
+            hook(self, *args)
 
     def _hook_fxn_aborts(self, hook_name, *args):
         """ run the named hook with supplied arguments, and return whether function raised Abort 
-        Error or not.
+        Error (or returned ABORT) or not. An absent hook never aborts.
         Returns: True or False
         """
+        hook = getattr(self._hooks, hook_name)
+        if hook is None:
+            return False
         try:
-            self._hook[hook_name](self, *args)
+            if hook(self, *args) is not ABORT:
+                return False
         except Abort:
-            self._abort_stats[hook_name] += 1
-            return True
-        return False
+            pass
+        self._abort_stats[hook_name] += 1
+        return True
+
+
+class _HookedSequence(_Hooked):
+    """ hook machinery shared by the sequences List and Array: index checks and the pre hook
+    decisions of slice assignment
+    """
+    __slots__ = ()
 
     def _verify_index_bounds(self, index, fxn_name='list assignment'):
         """ determine from provided index if operation would trigger index error. If it does, raise
@@ -79,204 +578,1906 @@ class List(list):
         if length == 0 or index >= length or index < -length:
             raise IndexError(fxn_name + ' index out of range')
 
+    def _verify_slices_are_valid(self, index, list_slice, replacement_slice):
+        """ verify that given slice (index) defines a valid slice given replacement_slice. In
+        general, if slice is standard (step-size of 1), slice will be valid. If step size is not
+        standard, list_slice and replacement_slice must be equal in length. If slice is invalid,
+        raise ValueError
+        """
+        if not type(index) == slice:
+            raise TypeError('list indices must be integer or slice, not ' + str(type(index)))
+        if index.step is not None and index.step != 1:
+            if index.step == 0:
+                raise ValueError('slice step cannot be zero')
+            if len(list_slice) != len(replacement_slice):
+                raise ValueError('attempt to assign sequence of size ' + str(len(replacement_slice))
+                                 + ' to extended slice of size ' + str(len(list_slice)))
+
+    def _decide_slice_assignment(self, list_slice, replacement):
+        """ run every pre hook for assigning replacement over list_slice, without changing the list.
+        Items in both slices are offered to pre_replace; items only in list_slice to pre_remove;
+        items only in replacement to pre_add (or pre_add_many).
+        Returns: (replaced, removed, added, contents) where replaced is a list of (item,
+        replacing_item) pairs, removed and added list the items that will leave / join the list,
+        and contents is what list_slice's range must hold afterwards
+        """
+        replaced = []
+        contents = []
+        for item, replacing_item in zip(list_slice, replacement):
+            if self._hook_fxn_aborts('pre_replace', item, replacing_item):
+                contents.append(item)
+            else:
+                replaced.append((item, replacing_item))
+                contents.append(replacing_item)
+        removed = []
+        for item in list_slice[len(replacement):]:
+            if self._hook_fxn_aborts('pre_remove', item):
+                contents.append(item)
+            else:
+                removed.append(item)
+        added = []
+        if len(replacement) > len(list_slice):
+            added = self._accepted_adds(replacement[len(list_slice):])
+            contents.extend(added)
+        return replaced, removed, added, contents
+
+
+class List(_HookedSequence, list):
+    """ A list that can call pre- and post- hook functions for the add, remove, and replace
+    operations. If the Abort exception is raised in any pre- hook call, the corresponding action
+    will not take place, and will not trigger the post- hook call either. A pre- hook may also
+    return ABORT instead, which has the same effect and is cheaper than raising an exception.
+    Pass indexed=True to get an IndexedList, which answers membership queries from a hash index.
+    """
+    __slots__ = _HOOKED_SLOTS + ('_validator', '__weakref__')
+
+    def __new__(cls, *args, indexed=False, **kwargs):
+        if indexed and not issubclass(cls, IndexedList):
+            if cls is not List:
+                raise TypeError(cls.__name__ + ' does not support indexed=True')
+            cls = IndexedList
+        return super().__new__(cls)
+
+    def __init__(self, *args, indexed=False, **kwargs):
+        """ init a list, with an optional "hook" keyword argument that supplies a dictionary
+        mapping a pre-action and post-action keyword to a function
+        """
+        super().__init__(*args)
+        self._validator = None
+        self._init_hooks(kwargs)
+
+    def _pickle_contents(self, protocol):
+        return (), {}, iter(self), None
+
+    def validate_in_parallel(self, executor, chunk_size=10000):
+        """ run a pure pre_add hook (see hookedup.pure) of bulk adds of at least chunk_size items
+        (extend, +=, *= and inserting through slice assignment) on executor, a
+        concurrent.futures thread or process pool, chunk_size items per task. A process pool needs
+        a hook that can be pickled, and spreads CPU heavy validation over all cores. All items are
+        validated before any is added; the accepted ones are then added in their original order
+        in one step, and post_add is called for each, in order. Such parallel calls are counted
+        in the abort stats, but not recorded in hook stats. Pass None to validate serially again.
+        """
+        self._validator = None if executor is None else _ParallelValidator(executor, chunk_size)
+
+    def _pure_pre_add(self, count):
+        """ Returns: the pre_add hook, if adding count items should validate them in parallel,
+        else None
+        """
+        validator = self._validator
+        if (validator is None or count < validator.chunk_size or
+                self._hooks.pre_add_many is not None):
+            return None
+        hook = self._installed_hooks().get('pre_add')
+        return hook if getattr(hook, 'hookedup_pure', False) else None
+
+    def _accepted_adds(self, items):
+        hook = self._pure_pre_add(len(items))
+        if hook is None:
+            return super()._accepted_adds(items)
+        accepted = self._validator.accepted(hook, items)
+        if len(accepted) < len(items):
+            self._abort_stats['pre_add'] += len(items) - len(accepted)
+        return accepted
+
+    def transaction(self):
+        """ group several operations so that they take effect together:
+        with L.transaction():
+            L.append(x)
+            del L[0:2]
+        Pre hooks run (and may Abort single operations) as each operation is made. Post hooks are
+        held back until the block ends, then called in order; if any raise, the rest are still
+        called and the first exception is re-raised. If the block raises an exception, the list
+        is restored to its state before the block and no post hooks are called. Raising Abort
+        inside the block rolls back silently; any other exception is re-raised.
+        Each operation still changes the list natively as it is made; a transaction does not
+        batch them into one native change. It only logs how to undo each change, which costs
+        O(changes), so that rolling back is as cheap as the changes were.
+        """
+        return _Transaction(self)
+
+    def _add_tracker(self, tracker):
+        """ report every change of this list to tracker, by calling
+        tracker.splice(list, start, removed, added) after each native commit. The call means that
+        the items in removed, which began at index start, were replaced by the items in added.
+        sort() and reverse() call tracker.permute(list, start, stop) instead, meaning that the
+        items in list[start:stop] were reordered in place.
+        """
+        self._trackers += (tracker,)
+        self._compile_hooks(self._installed_hooks())
+
+    def _remove_tracker(self, tracker):
+        """ stop reporting changes to tracker """
+        self._trackers = tuple(t for t in self._trackers if t is not tracker)
+        self._compile_hooks(self._installed_hooks())
+
+    def _track(self, start, removed, added):
+        """ report a committed change to every tracker (see _add_tracker) """
+        for tracker in self._trackers:
+            tracker.splice(self, start, removed, added)
+
+    def _track_permutation(self, start, stop):
+        """ report an in-place reordering of self[start:stop] to every tracker """
+        for tracker in self._trackers:
+            tracker.permute(self, start, stop)
+
+    def _splice(self, start, stop, items):
+        """ natively replace self[start:stop] with items, reporting the change to trackers """
+        removed = self[start:stop] if self._trackers else None
+        list.__setitem__(self, slice(start, stop), items)
+        if self._trackers:
+            self._track(start, removed, items)
+
+    def enable_journal(self):
+        """ start recording every change of this list in a Journal, if not already recording.
+        Consumers follow it with cursors to mirror the list with hookedup.replay in O(changes):
+        journal = L.enable_journal()
+        replica, cursor = list(L), journal.cursor()
+        ...
+        hookedup.replay(replica, cursor)
+        Returns: the Journal
+        """
+        journal = self.journal
+        if journal is None:
+            journal = Journal()
+            self._add_tracker(journal)
+        return journal
+
+    def disable_journal(self):
+        """ stop recording changes. The Journal keeps the ops already recorded """
+        journal = self.journal
+        if journal is not None:
+            self._remove_tracker(journal)
+
+    @property
+    def journal(self):
+        """ the Journal recording this list's changes, or None (see enable_journal) """
+        return next((tracker for tracker in self._trackers if isinstance(tracker, Journal)), None)
+
+    def on_change(self, callback, debounce=None, manual=False):
+        """ call callback(list, summary) with one ChangeSummary of the changes made since the last
+        call, instead of once per item. By default it is called after every operation (a whole
+        extend, slice assignment, *=, sort or transaction counts as one), right after the change
+        is made and before the post hooks. With debounce (seconds), it is called once the list has
+        been left unchanged that long, from a timer thread. With manual=True, it is only called
+        when flush() is called on the returned subscription. Hooks run as usual either way.
+        Returns: ChangeSubscription, whose cancel() stops the notifications
+        """
+        subscription = ChangeSubscription(self, callback, debounce, manual)
+        self._add_tracker(subscription)
+        return subscription
+
+    def _one_operation(self):
+        """ Returns: context manager that holds back on_change notifications until it exits, so
+        that the changes made inside it are reported together
+        """
+        subscriptions = [tracker for tracker in self._trackers
+                         if isinstance(tracker, ChangeSubscription)]
+        if not subscriptions:
+            return _nothing_held
+        stack = contextlib.ExitStack()
+        for subscription in subscriptions:
+            stack.enter_context(subscription.held())
+        return stack
+
+    def sort(self, *, key=None, reverse=False):
+        """ sort the list in place, like list.sort. No hooks are called, since no item is added or
+        removed; trackers and on_change subscribers see one permutation of the whole list.
+        """
+        if not self._trackers:
+            return list.sort(self, key=key, reverse=reverse)
+        self._log_reordering()
+        try:
+            list.sort(self, key=key, reverse=reverse)
+        finally:
+            self._track_permutation(0, len(self))
+
+    def reverse(self):
+        """ reverse the list in place, like list.reverse. No hooks are called; trackers and
+        on_change subscribers see one permutation of the whole list.
+        """
+        if not self._trackers:
+            return list.reverse(self)
+        self._log_reordering()
+        list.reverse(self)
+        self._track_permutation(0, len(self))
+
+    def _log_reordering(self):
+        """ inside a transaction, log the current order so that a rollback can restore it """
+        if self._transaction is not None:
+            order = list.copy(self)
+            self._transaction.undo.splice(self, 0, order, order)
+
+    def clear(self):
+        """ remove all items from list, starting at index 0. Call pre_remove for each item first,
+        keeping any item whose pre_remove raises Abort, then rebuild the list in one pass and call
+        post_remove for each removed item.
+        """
+        if not self._hooks.removes:
+            return list.clear(self)
+        self._remove_remaining_items_in_list_slice(slice(None), 0, len(self))
+
+    def extend(self, items):
+        """ append items individually, calling pre and post_add functions. If pre_add function
+        raises Abort, will not add that item. If batch hooks are installed, add all items in one
+        operation instead (see _add_many)
+        """
+        if not self._hooks.adds:
+            return list.extend(self, items)
+        if not isinstance(items, collections.abc.Iterable):
+            obj_type = str(type(items)).replace('>', '').replace('<class ', '')
+            raise TypeError(obj_type + ' object is not iterable')
+        hooks = self._hooks
+        if hooks.batch_adds or hooks.pre_add is None and hooks.post_add is None:
+            self._add_many(len(self), items)
+            return
+        if self._validator is not None:
+            items = list(items)
+            if self._pure_pre_add(len(items)) is not None:
+                self._add_many(len(self), items)
+                return
+        with self._one_operation():
+            for item in items:
+                self.append(item)  # recursive. Will trigger pre and post hooks in append fxn
+
+    def _add_many(self, index, items):
+        """ insert items at index in one operation. pre_add_many is called once with all items
+        and returns the accepted items (returning None accepts all of them; raising Abort accepts
+        none). Accepted items are committed with a single native splice, then post_add_many is
+        called once with them. A missing batch hook falls back to calling its per-item
+        counterpart (pre_add or post_add) for each item.
+        """
+        accepted = self._accepted_adds(list(items))
+        if accepted:
+            self._splice(index, index, accepted)
+            self._call_post_add_hooks(accepted)
+
     def insert(self, index, item):
         """ insert item into list at given index, unless pre_add function raises Abort. """
-        if self._hook_fxn_aborts('pre_add', item):
+        if not self._hooks.adds:
+            return list.insert(self, index, item)
+        if not self._hook_fxn_aborts('pre_add', item):
             super().insert(index, item)
+            if self._trackers:
+                self._track(slice(index, None).indices(len(self) - 1)[0], (), (item,))
             self._call_post_hook_fxn('post_add', item)
 
     def append(self, item):
         """ append item to end of list, unless pre_add function raises Abort """
+        if not self._hooks.adds:
+            return list.append(self, item)
         if not self._hook_fxn_aborts('pre_add', item):
             super().append(item)
+            if self._trackers:
+                self._track(len(self) - 1, (), (item,))
             self._call_post_hook_fxn('post_add', item)
         
     def pop(self, index=-1):
         """ Pop item @ index (or end of list if not supplied). If pre_remove function raises Abort,
         item will not be removed. Regardless of abort status, item will still be returned
         """
+        if not self._hooks.removes:
+            return list.pop(self, index)
         self._verify_index_bounds(index, "pop")
         item = self[index]
         if self._hook_fxn_aborts('pre_remove', item):
             return item  # return expected value even in Abort: return item w/o removing from list
         item = super().pop(index)
+        if self._trackers:
+            self._track(index if index >= 0 else index + len(self) + 1, (item,), ())
         self._call_post_hook_fxn('post_remove', item)
         return item
 
     def remove(self, item):
         """ remove first instance of item from list, unless pre_remove function raises Abort """
-        if item not in self:
-            raise ValueError('list.remove(x): x not in list')
+        if not self._hooks.removes:
+            return list.remove(self, item)
+        try:
+            index = self.index(item)
+        except ValueError:
+            raise ValueError('list.remove(x): x not in list') from None
         if not self._hook_fxn_aborts('pre_remove', item):
-            super().remove(item)
+            super().__delitem__(index)
+            if self._trackers:
+                self._track(index, (item,), ())
             self._call_post_hook_fxn('post_remove', item)
 
+    def move_to(self, dst, item_or_index, position=None):
+        """ move one item from this list into dst (another hookedup List, or this one) as a single
+        operation. item_or_index is the index of the item if it is an int, otherwise the item
+        itself (its first occurrence is moved). The item is inserted at position in dst, counted
+        after it has left this list, as dst.insert would; None appends it.
+        Each list calls its pre_move hook, as pre_move(lst, item, src, dst), or if it has no move
+        hooks, its pre_remove (this list) or pre_add (dst) hook. A list moving an item within
+        itself calls its move hooks once. Every pre hook runs before either list changes, and if
+        any raises Abort neither list changes. Post hooks are called the same way afterwards.
+        The locks of the ThreadSafeLists among the two lists are held throughout. They are taken
+        in a fixed order, so two threads moving items between the same lists in opposite
+        directions cannot deadlock. Raises RuntimeError if only one of the lists is in a
+        transaction, since rolling it back could not undo the other list's half of the move.
+        Returns: the item, whether it was moved or not
+        """
+        if not isinstance(dst, List):
+            obj_type = str(type(dst)).replace('>', '').replace('<class ', '')
+            raise TypeError('can only move items to a hookedup List, not ' + obj_type)
+        locks = {id(lst): lst._mutation_lock for lst in (self, dst)
+                 if isinstance(lst, ThreadSafeList)}
+        with contextlib.ExitStack() as stack:
+            for _, lock in sorted(locks.items()):
+                stack.enter_context(lock)
+            if (self._transaction is None) != (dst._transaction is None):
+                raise RuntimeError('cannot move items between a list in a transaction and a list '
+                                   'outside of one')
+            return self._move(dst, item_or_index, position)
+
+    def _move(self, dst, item_or_index, position):
+        """ move_to, once dst is known to be a List and both lists are locked """
+        if isinstance(item_or_index, int):
+            index = item_or_index
+            self._verify_index_bounds(index, 'move')
+            index %= len(self)
+            item = self[index]
+        else:
+            item = item_or_index
+            try:
+                index = self.index(item)
+            except ValueError:
+                raise ValueError('List.move_to(dst, x): x not in list') from None
+        calls = []  # (list, hook name suffix, hook arguments) for each list that calls hooks
+        for lst, fallback in ((self, 'remove'), (dst, 'add')):
+            hooks = lst._hooks
+            if hooks.pre_move is None and hooks.post_move is None:
+                calls.append((lst, fallback, (item,)))
+            elif not calls or calls[0][0] is not lst:
+                calls.append((lst, 'move', (item, self, dst)))
+        for lst, action, args in calls:
+            if lst._hook_fxn_aborts('pre_' + action, *args):
+                return item
+        held = _nothing_held if dst is self else dst._one_operation()
+        with self._one_operation(), held:
+            self._splice(index, index + 1, ())
+            if position is None:
+                position = len(dst)
+            position = slice(position, None).indices(len(dst))[0]
+            dst._splice(position, position, (item,))
+        for lst, action, args in calls:
+            lst._call_post_hook_fxn('post_' + action, *args)
+        return item
+
     def __iadd__(self, items):
         """ in-place add items. It is the same as extend(), but we must implement both here so that
         pre and post hooks are called properly
         """
+        if not self._hooks.adds:
+            return list.__iadd__(self, items)
         self.extend(items)
         return self
 
     def __imul__(self, multiplier):
+        hooks = self._hooks
+        if not hooks.adds and not hooks.removes:
+            return list.__imul__(self, multiplier)
         if not isinstance(multiplier, int):
             obj_type = str(type(multiplier)).replace('>', '').replace('<class ', '')
             raise TypeError(obj_type + 'object cannot be interpreted as an integer')
         if multiplier <= 0:
-            return self.clear()
+            self.clear()
+            return self
         original = list(self)
-        for i in range(1, multiplier):
-            self.extend(original)
+        if hooks.batch_adds:
+            self._add_many(len(self), original * (multiplier - 1))
+            return self
+        with self._one_operation():
+            for i in range(1, multiplier):
+                self.extend(original)
         return self
 
     def __delitem__(self, index):
         """ If index is an integer, delete item @ given index, calling pre and post remove hooks
         appropriately. If index is a slice, remove specified index range, calling pre and post
-        hooks for each item as it removes them. Due to the delitem's similarity to setitem, I have
-        borrowed several functions used in setitem to only delete the range specified by slice
+        hooks for each item as it removes them.
         """
+        if not self._hooks.removes:
+            return list.__delitem__(self, index)
         if type(index) == int:
             self._verify_index_bounds(index)
             item = self[index]
             if not self._hook_fxn_aborts('pre_remove', item):
                 super().__delitem__(index)
+                if self._trackers:
+                    self._track(index if index >= 0 else index + len(self) + 1, (item,), ())
                 self._call_post_hook_fxn('post_remove', item)
             return
-        list_slice = self[index]  # trigger standard error if index is not slice
-        last_index = self._replace_corresponding_items_in_both_slices(index, list_slice, [])
-        overflow = len(list_slice)
-        self._remove_remaining_items_in_list_slice(index, last_index, overflow)
+        self[index]  # trigger standard error if index is not slice
+        positions = range(*index.indices(len(self)))
+        self._remove_remaining_items_in_list_slice(index, positions.start, len(positions))
 
     def __setitem__(self, index, replacement):
         """ Replace item at index in list with replacement, unless pre_replace function raises
-        Abort. If setting more than one item at a time using slicing, replace items individually,
-        calling pre and post_replace functions for each. After replacing items, if slicing 
-        specifies more items to add, add additional items individually, calling pre and post_add 
-        functions for each. If slicing specifies items to remove from list, remove items
-        individually, calling pre and post_remove functions for each.
+        Abort. If setting more than one item at a time using slicing, call pre_replace for each
+        replaced item. If slicing specifies more items to add, call pre_add for each additional
+        item (or pre_add_many once). If slicing specifies items to remove from list, call
+        pre_remove for each of them. The surviving contents of the slice are then written with one
+        native slice assignment, followed by the post_replace, post_remove and post_add calls.
         self[0:3] = [0,1]  # replace two items on list (index 0 & 1) with two items
         self[0:3] = [0]  # replace one item on list (index 0), and remove other item (index 1) from list
         self[0:3] = [0,1,2]  # replace two items on list (index 0 & 1) with first two items on
                     list, then insert last item (2) into list @ end of replacement index (index 2)
         """
+        hooks = self._hooks
+        hooked = hooks.replaces if type(index) == int else (hooks.replaces or hooks.adds or
+                                                             hooks.removes)
+        if not hooked:
+            return list.__setitem__(self, index, replacement)
         if type(index) == int:
             self._verify_index_bounds(index)
             item = self[index]
             if not self._hook_fxn_aborts('pre_replace', item, replacement):
                 super().__setitem__(index, replacement)
+                if self._trackers:
+                    self._track(index if index >= 0 else index + len(self), (item,), (replacement,))
                 self._call_post_hook_fxn('post_replace', item, replacement)
             return
         list_slice = self[index]  # trigger standard error if index is not slice
         replacement = list(replacement)  # all fxns below expect a list-like object.
         self._verify_slices_are_valid(index, list_slice, replacement)
-        last_index = self._replace_corresponding_items_in_both_slices(index, list_slice, 
-                                                                      replacement)
-        overflow = len(list_slice) - len(replacement)
-        if overflow > 0:
-            self._remove_remaining_items_in_list_slice(index, last_index, overflow)
-        if overflow < 0:
-            self._add_remaining_items_in_replacement_slice(last_index, overflow, replacement)
+        replaced, removed, added, contents = self._decide_slice_assignment(list_slice, replacement)
+        self._write_slice(index, list_slice, contents, bool(replaced or removed or added))
+        for item, replacing_item in replaced:
+            self._call_post_hook_fxn('post_replace', item, replacing_item)
+        for item in removed:
+            self._call_post_hook_fxn('post_remove', item)
+        if added:
+            self._call_post_add_hooks(added)
 
-    def _verify_slices_are_valid(self, index, list_slice, replacement_slice):
-        """ verify that given slice (index) defines a valid slice given replacement_slice. In
-        general, if slice is standard (step-size of 1), slice will be valid. If step size is not
-        standard, list_slice and replacement_slice must be equal in length. If slice is invalid,
-        raise ValueError
+    def _write_slice(self, index, list_slice, contents, changed):
+        """ natively write contents (decided by _decide_slice_assignment) over the items of
+        list_slice, which is self[index]. changed tells whether contents differs from list_slice.
         """
-        if not type(index) == slice:
-            raise TypeError('list indices must be integer or slice, not ' + str(type(index)))
+        positions = range(*index.indices(len(self)))
         if index.step is not None and index.step != 1:
-            if index.step == 0:
-                raise ValueError('slice step cannot be zero')
-            if len(list_slice) != len(replacement_slice):
-                raise ValueError('attempt to assign sequence of size ' + str(len(replacement_slice))
-                                 + ' to extended slice of size ' + str(len(list_slice)))
-
-    def _replace_corresponding_items_in_both_slices(self, index, list_slice, replacement):
-        """ for as long as both slices have an item at a given index, replace list_slice's 
-        respective item in the list with replacement's item. Operation will end after either slice
-        has been fully iterated over.
-        Returns: index just after replacement operation ends. Can begin insert or remove from there
-        """
-        slice_range = index.indices(len(self))
-        i = slice_range[0]  # normally index.start, but adjusted to list size
-        for i, _, replacingItem in zip(range(*slice_range), list_slice, replacement):
-            self[i] = replacingItem  # recursive __setitem__ call will trigger pre, post hooks
-            i += 1  # compensate for adding/removing additional items after for-loop
-        return i
+            low = min(positions, default=0)
+            high = max(positions, default=-1) + 1
+            original = self[low:high] if self._trackers else None
+            list.__setitem__(self, index, contents)  # extended slice: same length as list_slice
+            if self._trackers and changed:
+                self._track(low, original, self[low:high])
+        else:
+            start = positions.start
+            list.__setitem__(self, slice(start, start + len(list_slice)), contents)
+            if self._trackers and changed:
+                self._track(start, list_slice, contents)
 
     def _remove_remaining_items_in_list_slice(self, islice, i, overflow):
-        """ attempt to remove overflow # of items from list, starting at index i, and call
-        pre_remove and post_remove functions. Will not remove item if pre_remove raises Abort
+        """ attempt to remove overflow # of items from list, starting at index i and moving by
+        the slice's step, and call pre_remove and post_remove functions. Will not remove item if
+        pre_remove raises Abort. All pre_remove calls run first (in slice order), then the
+        surviving items are written back in a single pass, then post_remove runs for each removed
+        item, so the whole operation costs O(n) rather than one element shift per removal.
         """
         step = islice.step or 1
-        for _ in range(overflow):
-            item = self[i]
-            if self._hook_fxn_aborts('pre_remove', item):
-                i += step  # avoid removal attempt of same item
-                continue
-            super().__delitem__(i)
+        positions = range(i, i + overflow * step, step)
+        if not positions:
+            return
+        removed = []
+        removed_positions = set()
+        for position in positions:
+            item = self[position]
+            if not self._hook_fxn_aborts('pre_remove', item):
+                removed.append(item)
+                removed_positions.add(position)
+        self._write_removals(positions, removed_positions)
+        for item in removed:
             self._call_post_hook_fxn('post_remove', item)
-            if step > 0:
-                i += step - 1  # normally 0, but compensdated for larger step-sizes
-            else:
-                i += step  # negative steps do not need compensation for removing at an index
 
-    def _add_remaining_items_in_replacement_slice(self, i, overflow, replacement):
-        """ insert remaining items in replacement slice to self list, unless pre_add aborts.
-        overflow: a negative number whose absolute value indicate the number of items to insert
+    def _write_removals(self, positions, removed_positions):
+        """ natively delete the items at removed_positions, a subset of the range positions, in one
+        pass over the part of the list that positions spans
         """
-        for repl_index in range(overflow, 0, 1):
-            item = replacement[repl_index]
-            if not self._hook_fxn_aborts('pre_add', item):
-                super().insert(i, item)
-                i += 1
-                self._call_post_hook_fxn('post_add', item)
+        if not removed_positions:
+            return
+        low, high = min(positions[0], positions[-1]), max(positions[0], positions[-1]) + 1
+        original = self[low:high] if self._trackers else None
+        if len(removed_positions) == len(positions):
+            list.__delitem__(self, slice(low, high, abs(positions.step)))
+        else:
+            survivors = [item for position, item in enumerate(self[low:high], low)
+                         if position not in removed_positions]
+            list.__setitem__(self, slice(low, high), survivors)
+        if self._trackers:
+            self._track(low, original, self[low:high - len(removed_positions)])
 
 
-class PreventOverwriteProperty:
-    
-    @classmethod
-    def setup(cls, *args, **kwargs):
-        """setup for property(). Inside a separate class, call
-        property(PreventOverwriteProperty(L, **hooks)) where 
-        L is a premade list you want each time, and **hooks is a dictionary of
-        the hooks you want installed in the list. Each time an owner accesses
-        it's list, it will get the same list (created the first time it's
-        accessed, and found in a dictionary each time after that)
-        """
-        self = cls()
-        self._owners = {}
-        construct_list = lambda: List(*args, **kwargs)
+class _ItemIndex:
+    """ multiset of the items in a List, kept up to date as a tracker (see List._add_tracker).
+    Unhashable items cannot be counted, so only how many of them there are is remembered.
+    """
 
-        def getter(owner):
-            if owner in self._owners:
-                return self._owners[owner]
-            L = construct_list()
-            self._owners[owner] = L
-            return L
+    def __init__(self, items):
+        self.counts = {}
+        self.unhashable = 0
+        self.add(items)
 
-        return getter
+    def splice(self, lst, start, removed, added):
+        self.discard(removed)
+        self.add(added)
 
+    def permute(self, lst, start, stop):
+        pass  # reordering leaves the counts as they are
 
-class PreventHookedupOverwriteReset:
-    """ inherit from this to prevent a hookedup List from being overwritten and/or reset. When user
-    attempts to set attribute of inheriting class, if attribute already on class is a hookedup
-    List, this raises AttributeError (unless it is the same object, as a case would be when using
-    *= or +=). User instead should use.clear() to attempt to clear attribute and then update it 
-    accordingly.
-    for example:
-    Class Example(PreventHookedupOverwriteReset):
-        pass
-    a = A()
-    a.list = hookedup.List()  # a.list cannot be reset or set to anything else once it has been set
-                              # to hookedup.List
-    a.list = []  # raises AttributeError
-    a.list = hookedup.List()  # also raises AttributeError
-    """
+    def add(self, items):
+        counts = self.counts
+        for item in items:
+            try:
+                counts[item] = counts.get(item, 0) + 1
+            except TypeError:
+                self.unhashable += 1
 
-    def __setattr__(self, attr_name, attr):
-        try:
+    def discard(self, items):
+        counts = self.counts
+        for item in items:
+            try:
+                remaining = counts[item] - 1
+            except TypeError:
+                self.unhashable -= 1
+                continue
+            if remaining:
+                counts[item] = remaining
+            else:
+                del counts[item]
+
+    def count(self, item):
+        """ Returns: number of times item is in the list, or None if that is unknown because item
+        is unhashable or could compare equal to one of the unhashable items in the list
+        """
+        try:
+            found = self.counts.get(item, 0)
+        except TypeError:
+            return None
+        if found or not self.unhashable:
+            return found
+        return None
+
+
+class IndexedList(List):
+    """ a hookedup List that keeps a count of each of its items in a hash index. Membership tests
+    and count() answer from the index in O(1), and index() / remove() fail in O(1) for absent
+    items, needing a single scan otherwise. Every mutation updates the index, so all operations
+    take the hooked path. Unhashable items fall back to scanning the list.
+    """
+    __slots__ = ('_index',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = _ItemIndex(self)
+        self._add_tracker(self._index)
+
+    def __contains__(self, item):
+        found = self._index.count(item)
+        if found is None:
+            return super().__contains__(item)
+        return found > 0
+
+    def count(self, item):
+        found = self._index.count(item)
+        if found is None:
+            return super().count(item)
+        return found
+
+    def index(self, item, *args):
+        if self._index.count(item) == 0:
+            raise ValueError(repr(item) + ' is not in list')
+        return super().index(item, *args)
+
+
+JournalOp = collections.namedtuple('JournalOp', 'kind start stop items')
+JournalOp.__doc__ = """ one recorded change of a List: the items that were at [start:stop] were
+replaced by the tuple items. kind is 'insert' (start == stop), 'delete' (no items), 'replace'
+(as many items as were there) or 'splice' (anything else) """
+
+
+def _op_kind(start, stop, items):
+    if start == stop:
+        return 'insert'
+    if not items:
+        return 'delete'
+    return 'replace' if stop - start == len(items) else 'splice'
+
+
+class Journal:
+    """ compact record of the changes made to a List, kept as a tracker (see List.enable_journal).
+    Every native commit becomes one JournalOp. A new op that continues the last one (appending or
+    inserting next to the last insert, deleting next to the last delete, replacing the items just
+    after the last replace) is merged into it, as long as no cursor has read the last op yet.
+    Consumers follow the journal with cursors and apply what they read with replay().
+    Ops are kept until trim() is called, which drops those read by every live cursor.
+    """
+
+    def __init__(self):
+        self.ops = []
+        self.offset = 0  # sequence number of ops[0]; ops before it have been trimmed
+        self._sealed = 0  # sequence number of the first op that may still be merged into
+        self._cursors = weakref.WeakSet()
+
+    @property
+    def end(self):
+        """ sequence number that the next op will get """
+        return self.offset + len(self.ops)
+
+    def splice(self, lst, start, removed, added):
+        stop = start + len(removed)
+        added = tuple(added)
+        if self.end > self._sealed:
+            merged = self._merge(self.ops[-1], start, stop, added)
+            if merged is not None:
+                self.ops[-1] = merged
+                return
+        self.ops.append(JournalOp(_op_kind(start, stop, added), start, stop, added))
+
+    def permute(self, lst, start, stop):
+        """ record a reordering as one replace op of the reordered range """
+        self.splice(lst, start, range(start, stop), lst[start:stop])
+
+    @staticmethod
+    def _merge(last, start, stop, added):
+        """ Returns: one JournalOp with the effect of last followed by the given change, or None if
+        the two do not form a single range of the same kind
+        """
+        if last.kind == 'insert' and start == stop:
+            if start == last.start + len(last.items):
+                return last._replace(items=last.items + added)
+            if start == last.start:
+                return last._replace(items=added + last.items)
+        elif last.kind == 'delete' and not added:
+            if start == last.start:
+                return last._replace(stop=last.stop + stop - start)
+            if stop == last.start:
+                return last._replace(start=start, stop=last.stop - last.start + stop)
+        elif last.kind == 'replace' and start == last.stop and stop - start == len(added) > 0:
+            return last._replace(stop=stop, items=last.items + added)
+        return None
+
+    def cursor(self, from_start=False):
+        """ Returns: JournalCursor that reads the ops recorded from now on (or every op still kept,
+        if from_start). Start a replica from a copy of the list taken at the same time:
+        replica, cursor = list(L), journal.cursor()
+        """
+        cursor = JournalCursor(self, self.offset if from_start else self.end)
+        self._sealed = self.end  # later changes must become ops the new cursor will read
+        self._cursors.add(cursor)
+        return cursor
+
+    def trim(self):
+        """ forget the ops that every live cursor has read (all ops, if there are no cursors) """
+        keep_from = min((cursor.position for cursor in self._cursors), default=self.end)
+        del self.ops[:keep_from - self.offset]
+        self.offset = keep_from
+        self._sealed = max(self._sealed, self.offset)
+
+
+class JournalCursor:
+    """ reading position in a Journal. Iterating a cursor yields the ops recorded since the last
+    time it was read, and advances it past them:
+    for op in cursor: ...  # or: hookedup.replay(replica, cursor)
+    """
+
+    def __init__(self, journal, position):
+        self.journal = journal
+        self.position = position
+
+    def __iter__(self):
+        journal = self.journal
+        if self.position < journal.offset:
+            raise LookupError('journal ops this cursor has not read were trimmed')
+        while self.position < journal.end:
+            journal._sealed = max(journal._sealed, journal.end)
+            op = journal.ops[self.position - journal.offset]
+            self.position += 1
+            yield op
+
+    def read(self):
+        """ Returns: list of the ops recorded since the last read """
+        return list(self)
+
+
+def replay(target, ops):
+    """ apply ops (JournalOps, for example from a JournalCursor) to target, a list that held the
+    same items as the journaled List did before the first op. Costs O(size of the changes) for
+    changes at the end of the list, like the native list operations they stand for.
+    Returns: target
+    """
+    for op in ops:
+        target[op.start:op.stop] = op.items
+    return target
+
+
+ChangeSummary = collections.namedtuple('ChangeSummary', 'ranges added removed permuted')
+ChangeSummary.__doc__ = """ the changes made to a List since the last on_change notification.
+ranges is a sorted tuple of (start, stop) index ranges of the list as it is now, covering every
+item that was added, replaced or moved (an empty range marks where items were only removed).
+added and removed count items; replacing an item counts once in each. permuted is True if sort()
+or reverse() reordered items, which is reported as the reordered range, not as replacements.
+"""
+
+
+class ChangeSubscription:
+    """ coalesces the changes of a List into ChangeSummary notifications, as a tracker (see
+    List.on_change). Overlapping and adjacent changes are merged into one range, and ranges
+    are shifted as later changes insert or remove items before them.
+    """
+
+    def __init__(self, lst, callback, debounce=None, manual=False):
+        self.list = lst
+        self.callback = callback
+        self.debounce = debounce
+        self.manual = manual
+        self._lock = threading.Lock()
+        self._holds = 0
+        self._timer = None
+        self._deadline = 0
+        self._reset()
+
+    def _reset(self):
+        self._ranges = []
+        self._added = self._removed = 0
+        self._permuted = False
+        self._pending = False
+
+    def splice(self, lst, start, removed, added):
+        with self._lock:
+            self._merge(start, start + len(removed), start + len(added))
+            self._added += len(added)
+            self._removed += len(removed)
+        self._changed()
+
+    def permute(self, lst, start, stop):
+        with self._lock:
+            self._merge(start, stop, stop)
+            self._permuted = True
+        self._changed()
+
+    def _merge(self, start, stop, new_stop):
+        """ record that [start:stop] became [start:new_stop], merging the pending ranges that
+        touch it and shifting the ones after it
+        """
+        shift = new_stop - stop
+        low, high = start, new_stop
+        ranges = []
+        for range_start, range_stop in self._ranges:
+            if range_stop < start:
+                ranges.append((range_start, range_stop))
+            elif range_start > stop:
+                ranges.append((range_start + shift, range_stop + shift))
+            else:
+                low = min(low, range_start)
+                high = max(high, range_stop + shift)
+        ranges.append((low, high))
+        ranges.sort()
+        self._ranges = ranges
+        self._pending = True
+
+    def _changed(self):
+        if self._holds or self.manual:
+            return
+        if self.debounce is None:
+            self.flush()
+            return
+        with self._lock:
+            self._deadline = time.monotonic() + self.debounce
+            if self._timer is None:
+                self._start_timer(self.debounce)
+
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire(self):
+        with self._lock:
+            remaining = self._deadline - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+        self.flush()
+
+    @contextlib.contextmanager
+    def held(self):
+        """ hold back notifications until the block ends, then notify once for all changes """
+        self._holds += 1
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            if not self._holds and self._pending:
+                self._changed()
+
+    def flush(self):
+        """ call the callback now with the pending changes, if there are any """
+        with self._lock:
+            if not self._pending:
+                return
+            summary = ChangeSummary(tuple(self._ranges), self._added, self._removed,
+                                    self._permuted)
+            self._reset()
+        self.callback(self.list, summary)
+
+    def cancel(self):
+        """ stop notifying; changes not yet notified are dropped """
+        self.list._remove_tracker(self)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._reset()
+
+
+_HOOK_FAMILIES = (('pre_add', 'post_add', 'pre_add_many', 'post_add_many'),
+                  ('pre_remove', 'post_remove'), ('pre_replace', 'post_replace'),
+                  ('pre_move', 'post_move'))
+
+
+class AsyncList(List):
+    """ a hookedup List for asyncio code, whose hooks may be coroutine functions (plain functions
+    work too). Change it through the awaitable mutators aappend, ainsert, aextend, apop, aremove,
+    aclear, asetitem and adelitem. Pre hooks are awaited one at a time and may raise Abort, as with
+    List. Bulk operations (aextend, aclear and slices) await every pre hook before committing the
+    result in one native splice, then start their post hooks in order and run them concurrently
+    with asyncio.gather, at most max_concurrency at a time (unlimited if None).
+    Async mutators of one list run one after another, hooks included, so a hook must not await a
+    mutator of its own list. Synchronous mutators still work for operations without hooks, but
+    raise TypeError, before changing anything, for operations that have hooks.
+    """
+
+    __slots__ = ('max_concurrency', '_async_lock', '_async_hooks', '_async_calls')
+
+    def __init__(self, *args, max_concurrency=None, **kwargs):
+        self.max_concurrency = max_concurrency
+        self._async_lock = None
+        self._async_hooks = self._async_calls = {}
+        super().__init__(*args, **kwargs)
+
+    def _compile_hooks(self, hooks):
+        """ keep hooks for the async mutators (wrapped to record into hook_stats, if it is set),
+        and give the synchronous mutators a hook that raises TypeError for every operation that
+        has hooks. The blocking hooks are never instrumented
+        """
+        self._async_hooks = hooks
+        stats = self.hook_stats
+        self._async_calls = hooks if stats is None else {
+            hook_name: stats.wrap_async(hook_name, hook) for hook_name, hook in hooks.items()}
+        blocked = {}
+        for family in _HOOK_FAMILIES:
+            if any(hook_name in hooks for hook_name in family):
+                blocked.update((hook_name, self._sync_call_prohibited) for hook_name in family)
+        self._hooks = _hook_profile(blocked, bool(self._trackers), None,
+                                    self._post_hook_wrappers())
+
+    def _installed_hooks(self):
+        return self._async_hooks
+
+    def _pickle_contents(self, protocol):
+        args, kwargs, listitems, dictitems = super()._pickle_contents(protocol)
+        kwargs['max_concurrency'] = self.max_concurrency
+        return args, kwargs, listitems, dictitems
+
+    @staticmethod
+    def _sync_call_prohibited(*_):
+        raise TypeError('AsyncList operations with hooks must be awaited, e.g. await L.aappend(x)')
+
+    def transaction(self):
+        raise TypeError('AsyncList does not support transactions')
+
+    def _lock(self):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+    async def _apre_aborts(self, hook_name, *args):
+        """ await the named pre hook, if installed. Returns: whether it raised Abort or returned
+        ABORT
+        """
+        hook = self._async_calls.get(hook_name)
+        if hook is None:
+            return False
+        try:
+            result = hook(self, *args)
+            if inspect.isawaitable(result):
+                result = await result
+        except Abort:
+            result = ABORT
+        if result is ABORT:
+            self._abort_stats[hook_name] += 1
+            return True
+        return False
+
+    async def _apost(self, hook_name, *args):
+        """ await the named post hook, if installed """
+        hook = self._async_calls.get(hook_name)
+        if hook is not None:
+            result = hook(self, *args)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _apost_each(self, hook_name, args_list):
+        """ call the named post hook once per tuple of arguments in args_list, concurrently """
+        if hook_name not in self._async_hooks or not args_list:
+            return
+        if self.max_concurrency is None:
+            await asyncio.gather(*(self._apost(hook_name, *args) for args in args_list))
+            return
+        limit = asyncio.Semaphore(self.max_concurrency)
+
+        async def limited(args):
+            async with limit:
+                await self._apost(hook_name, *args)
+        await asyncio.gather(*(limited(args) for args in args_list))
+
+    async def _aaccepted_adds(self, items):
+        """ async counterpart of List._accepted_adds """
+        hook = self._async_calls.get('pre_add_many')
+        if hook is None:
+            return [item for item in items if not await self._apre_aborts('pre_add', item)]
+        try:
+            accepted = hook(self, items)
+            if inspect.isawaitable(accepted):
+                accepted = await accepted
+        except Abort:
+            accepted = ABORT
+        if accepted is ABORT:
+            self._abort_stats['pre_add_many'] += 1
+            return []
+        return items if accepted is None else list(accepted)
+
+    async def _apost_adds(self, added):
+        """ async counterpart of List._call_post_add_hooks """
+        if 'post_add_many' in self._async_hooks:
+            await self._apost('post_add_many', added)
+        else:
+            await self._apost_each('post_add', [(item,) for item in added])
+
+    async def aappend(self, item):
+        """ append item to end of list, unless pre_add raises Abort """
+        async with self._lock():
+            if not await self._apre_aborts('pre_add', item):
+                self._splice(len(self), len(self), [item])
+                await self._apost('post_add', item)
+
+    async def ainsert(self, index, item):
+        """ insert item into list at given index, unless pre_add raises Abort """
+        async with self._lock():
+            if not await self._apre_aborts('pre_add', item):
+                position = slice(index, None).indices(len(self))[0]
+                self._splice(position, position, [item])
+                await self._apost('post_add', item)
+
+    async def aextend(self, items):
+        """ add the items accepted by pre_add_many (or by pre_add for each item) to the end of the
+        list in one step, then run post_add_many (or post_add for each item, concurrently)
+        """
+        async with self._lock():
+            accepted = await self._aaccepted_adds(list(items))
+            if accepted:
+                self._splice(len(self), len(self), accepted)
+                await self._apost_adds(accepted)
+
+    async def apop(self, index=-1):
+        """ Pop item @ index (or end of list if not supplied), unless pre_remove raises Abort.
+        Returns: the item, whether removed or not
+        """
+        async with self._lock():
+            self._verify_index_bounds(index, 'pop')
+            item = self[index]
+            if not await self._apre_aborts('pre_remove', item):
+                position = index if index >= 0 else index + len(self)
+                self._splice(position, position + 1, [])
+                await self._apost('post_remove', item)
+            return item
+
+    async def aremove(self, item):
+        """ remove first instance of item from list, unless pre_remove raises Abort """
+        async with self._lock():
+            try:
+                position = self.index(item)
+            except ValueError:
+                raise ValueError('list.remove(x): x not in list') from None
+            if not await self._apre_aborts('pre_remove', item):
+                self._splice(position, position + 1, [])
+                await self._apost('post_remove', item)
+
+    async def aclear(self):
+        """ remove all items from list, except those whose pre_remove raises Abort """
+        await self.adelitem(slice(None))
+
+    async def asetitem(self, index, replacement):
+        """ async counterpart of L[index] = replacement, for an integer index or a slice """
+        async with self._lock():
+            if type(index) == int:
+                self._verify_index_bounds(index)
+                item = self[index]
+                if not await self._apre_aborts('pre_replace', item, replacement):
+                    position = index if index >= 0 else index + len(self)
+                    self._splice(position, position + 1, [replacement])
+                    await self._apost('post_replace', item, replacement)
+                return
+            list_slice = self[index]  # trigger standard error if index is not slice
+            replacement = list(replacement)
+            self._verify_slices_are_valid(index, list_slice, replacement)
+            replaced = []
+            contents = []
+            for item, replacing_item in zip(list_slice, replacement):
+                if await self._apre_aborts('pre_replace', item, replacing_item):
+                    contents.append(item)
+                else:
+                    replaced.append((item, replacing_item))
+                    contents.append(replacing_item)
+            removed = []
+            for item in list_slice[len(replacement):]:
+                if await self._apre_aborts('pre_remove', item):
+                    contents.append(item)
+                else:
+                    removed.append(item)
+            added = []
+            if len(replacement) > len(list_slice):
+                added = await self._aaccepted_adds(replacement[len(list_slice):])
+                contents.extend(added)
+            self._write_slice(index, list_slice, contents, bool(replaced or removed or added))
+            await self._apost_each('post_replace', replaced)
+            await self._apost_each('post_remove', [(item,) for item in removed])
+            if added:
+                await self._apost_adds(added)
+
+    async def adelitem(self, index):
+        """ async counterpart of del L[index], for an integer index or a slice """
+        async with self._lock():
+            if type(index) == int:
+                self._verify_index_bounds(index)
+                item = self[index]
+                if not await self._apre_aborts('pre_remove', item):
+                    position = index if index >= 0 else index + len(self)
+                    self._splice(position, position + 1, [])
+                    await self._apost('post_remove', item)
+                return
+            self[index]  # trigger standard error if index is not slice
+            positions = range(*index.indices(len(self)))
+            removed = []
+            removed_positions = set()
+            for position in positions:
+                item = self[position]
+                if not await self._apre_aborts('pre_remove', item):
+                    removed.append(item)
+                    removed_positions.add(position)
+            if removed:
+                self._write_removals(positions, removed_positions)
+                await self._apost_each('post_remove', [(item,) for item in removed])
+
+
+class _PostHookDispatcher:
+    """ runs post hooks on a concurrent.futures executor. If ordered, the hooks run one at a time
+    in the order they were submitted; otherwise each runs as its own task. Exceptions raised by
+    the hooks are kept until wait() is called.
+    """
+
+    def __init__(self, executor, ordered):
+        self.executor = executor
+        self.ordered = ordered
+        self.idle = threading.Condition()
+        self.outstanding = 0
+        self.pending = collections.deque()
+        self.draining = False
+        self.errors = []
+
+    def wrap(self, hook):
+        """ Returns: function that submits hook and its arguments instead of calling it """
+        return lambda *args: self.submit(hook, args)
+
+    def submit(self, hook, args):
+        with self.idle:
+            self.outstanding += 1
+            if self.ordered:
+                self.pending.append((hook, args))
+                if self.draining:
+                    return  # the running drain task will get to it
+                self.draining = True
+        try:
+            if self.ordered:
+                self.executor.submit(self._drain)
+            else:
+                self.executor.submit(self._run, hook, args)
+        except BaseException:
+            with self.idle:  # nothing was submitted: forget the hook (the only one pending)
+                self.outstanding -= 1
+                if self.ordered:
+                    self.pending.pop()
+                    self.draining = False
+                if not self.outstanding:
+                    self.idle.notify_all()
+            raise
+
+    def _drain(self):
+        while True:
+            with self.idle:
+                if not self.pending:
+                    self.draining = False
+                    return
+                hook, args = self.pending.popleft()
+            self._run(hook, args)
+
+    def _run(self, hook, args):
+        try:
+            hook(*args)
+        except BaseException as error:
+            with self.idle:
+                self.errors.append(error)
+        finally:
+            with self.idle:
+                self.outstanding -= 1
+                if not self.outstanding:
+                    self.idle.notify_all()
+
+    def wait(self, timeout=None):
+        """ block until every submitted hook has run, then raise the first exception any of them
+        raised since the last wait(). Raises TimeoutError if timeout seconds pass first.
+        """
+        with self.idle:
+            if not self.idle.wait_for(lambda: not self.outstanding, timeout):
+                raise TimeoutError('post hooks still running')
+            errors, self.errors = self.errors, []
+        if errors:
+            raise errors[0]
+
+
+def _locked(method):
+    """ Returns: method wrapped to hold the list's _mutation_lock while it runs """
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._mutation_lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class ThreadSafeList(List):
+    """ a hookedup List that may be changed from several threads. Each operation holds the list's
+    reentrant lock from its pre hooks through the native commit, so no other thread's change can
+    slip in between (a hook may still change the list it belongs to). Post hooks run inline, still
+    under the lock, unless a concurrent.futures executor is given: then they are submitted to it.
+    With ordered=True they run one at a time in the order the changes were made; with
+    ordered=False they run independently, in any order. wait_post_hooks() blocks until submitted
+    post hooks are done and re-raises the first exception one of them raised.
+    """
+    __slots__ = ('_mutation_lock', '_dispatcher')
+
+    def __init__(self, *args, executor=None, ordered=True, **kwargs):
+        self._mutation_lock = threading.RLock()
+        self._dispatcher = None if executor is None else _PostHookDispatcher(executor, ordered)
+        super().__init__(*args, **kwargs)
+
+    def _post_hook_wrappers(self):
+        wrappers = super()._post_hook_wrappers()
+        if self._dispatcher is None:
+            return wrappers
+        return (self._dispatcher.wrap,) + wrappers
+
+    def wait_post_hooks(self, timeout=None):
+        """ block until every post hook submitted to the executor has run (see class doc) """
+        if self._dispatcher is not None:
+            self._dispatcher.wait(timeout)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """ List.transaction(), holding the lock for the whole block """
+        with self._mutation_lock, super().transaction() as lst:
+            yield lst
+
+    append = _locked(List.append)
+    extend = _locked(List.extend)
+    insert = _locked(List.insert)
+    pop = _locked(List.pop)
+    remove = _locked(List.remove)
+    clear = _locked(List.clear)
+    sort = _locked(List.sort)
+    reverse = _locked(List.reverse)
+    set_hooks = _locked(List.set_hooks)
+    __setitem__ = _locked(List.__setitem__)
+    __delitem__ = _locked(List.__delitem__)
+    __iadd__ = _locked(List.__iadd__)
+    __imul__ = _locked(List.__imul__)
+
+
+class Set(_Hooked, set):
+    """ A set that calls the same pre- and post- hook functions as List when members are added or
+    removed (sets have no replace operation). Adding a member that is already present, or
+    discarding one that is absent, calls no hooks. Bulk operations (update / |=,
+    difference_update / -=, intersection_update / &=, symmetric_difference_update / ^= and clear)
+    call every pre hook first, then change the set natively in one step, then call the post hooks
+    of the members that were really added or removed. If a pre hook raises Abort, that member is
+    left as it was. update and |= also call the batch hooks pre_add_many and post_add_many.
+    """
+    __slots__ = _HOOKED_SLOTS
+    _hook_names = tuple(name for name in HOOK_NAMES if not name.endswith(('_replace', '_move')))
+    _hookedup_name = 'Set'
+
+    def __init__(self, *args, **kwargs):
+        """ init a set from an optional iterable, with pre- and post- hooks given as keywords """
+        super().__init__(*args)
+        self._init_hooks(kwargs)
+
+    def _pickle_contents(self, protocol):
+        return (set(self),), {}, None, None
+
+    def add(self, item):
+        """ add item to set, unless it is already a member or pre_add function raises Abort """
+        if not self._hooks.adds or item in self:
+            return set.add(self, item)
+        if not self._hook_fxn_aborts('pre_add', item):
+            set.add(self, item)
+            self._call_post_hook_fxn('post_add', item)
+
+    def remove(self, item):
+        """ remove item from set, unless pre_remove function raises Abort. Raises KeyError if item
+        is not a member
+        """
+        if not self._hooks.removes:
+            return set.remove(self, item)
+        if item not in self:
+            raise KeyError(item)
+        self._remove_members((item,))
+
+    def discard(self, item):
+        """ remove item from set if it is a member, unless pre_remove function raises Abort """
+        if not self._hooks.removes or item not in self:
+            return set.discard(self, item)
+        self._remove_members((item,))
+
+    def pop(self):
+        """ remove and return an arbitrary member. If pre_remove function raises Abort, the member
+        stays in the set but is still returned
+        """
+        if not self._hooks.removes:
+            return set.pop(self)
+        if not self:
+            raise KeyError('pop from an empty set')
+        item = next(iter(self))
+        self._remove_members((item,))
+        return item
+
+    def clear(self):
+        """ remove all members, except those whose pre_remove function raises Abort """
+        if not self._hooks.removes:
+            return set.clear(self)
+        self._remove_members(list(self))
+
+    def update(self, *others):
+        """ add the members of each of others, calling add hooks for those not yet in the set """
+        if not self._hooks.adds:
+            return set.update(self, *others)
+        adding = [item for item in dict.fromkeys(itertools.chain(*others)) if item not in self]
+        accepted = self._accepted_adds(adding)
+        if accepted:
+            set.update(self, accepted)
+            self._call_post_add_hooks(accepted)
+
+    def difference_update(self, *others):
+        """ remove the members of each of others from the set """
+        if not self._hooks.removes:
+            return set.difference_update(self, *others)
+        self._remove_members([item for item in dict.fromkeys(itertools.chain(*others))
+                              if item in self])
+
+    def intersection_update(self, *others):
+        """ remove the members that are not in every one of others """
+        if not self._hooks.removes:
+            return set.intersection_update(self, *others)
+        keep = set.intersection(self, *others)
+        self._remove_members([item for item in self if item not in keep])
+
+    def symmetric_difference_update(self, other):
+        """ remove the members that are in other, and add those of other that are not members.
+        All pre hooks run (removals first) before the set changes
+        """
+        hooks = self._hooks
+        if not hooks.adds and not hooks.removes:
+            return set.symmetric_difference_update(self, other)
+        other = dict.fromkeys(other)
+        removed = [item for item in other if item in self and
+                   not self._hook_fxn_aborts('pre_remove', item)]
+        added = self._accepted_adds([item for item in other if item not in self])
+        set.difference_update(self, removed)
+        set.update(self, added)
+        for item in removed:
+            self._call_post_hook_fxn('post_remove', item)
+        if added:
+            self._call_post_add_hooks(added)
+
+    def _remove_members(self, items):
+        """ call pre_remove for each of items (all members), natively remove those not aborted in
+        one step, then call post_remove for each removed member
+        """
+        removed = [item for item in items if not self._hook_fxn_aborts('pre_remove', item)]
+        set.difference_update(self, removed)
+        for item in removed:
+            self._call_post_hook_fxn('post_remove', item)
+
+    def __ior__(self, other):
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        if not isinstance(other, collections.abc.Set):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+
+class Dict(_Hooked, dict):
+    """ A dict that calls pre- and post- hook functions when a key is added, removed, or given a
+    new value. Hooks receive the dict and the key, followed by the value:
+    pre_add(d, key, value), pre_remove(d, key, value), pre_replace(d, key, old_value, new_value)
+    and the same for post hooks. If a pre hook raises Abort, that key is left as it was.
+    update / |= call every pre hook first (replacements, then additions), change the dict natively
+    in one step, then call the post hooks. The batch hooks pre_add_many and post_add_many are
+    called with a list of the (key, value) pairs being added; pre_add_many returns the accepted
+    pairs, like the batch hooks of List.
+    """
+    __slots__ = _HOOKED_SLOTS + ('__weakref__',)
+    _hook_names = tuple(name for name in HOOK_NAMES if not name.endswith('_move'))
+    _hookedup_name = 'Dict'
+
+    def __init__(self, *args, **kwargs):
+        """ init a dict from an optional mapping or iterable of pairs, with pre- and post- hooks
+        given as keywords (so, unlike dict, keyword arguments are not items)
+        """
+        super().__init__(*args)
+        self._init_hooks(kwargs)
+
+    def _pickle_contents(self, protocol):
+        return (), {}, None, iter(self.items())
+
+    def __setitem__(self, key, value):
+        """ set d[key] to value, calling the replace hooks if key is present and the add hooks if
+        it is not. Does nothing if the pre hook raises Abort
+        """
+        hooks = self._hooks
+        if key in self:
+            if not hooks.replaces:
+                return dict.__setitem__(self, key, value)
+            old = dict.__getitem__(self, key)
+            if not self._hook_fxn_aborts('pre_replace', key, old, value):
+                dict.__setitem__(self, key, value)
+                self._call_post_hook_fxn('post_replace', key, old, value)
+        elif not hooks.adds:
+            dict.__setitem__(self, key, value)
+        elif not self._hook_fxn_aborts('pre_add', key, value):
+            dict.__setitem__(self, key, value)
+            self._call_post_hook_fxn('post_add', key, value)
+
+    def __delitem__(self, key):
+        """ delete d[key], unless pre_remove function raises Abort """
+        if not self._hooks.removes:
+            return dict.__delitem__(self, key)
+        self._remove_pairs([(key, dict.__getitem__(self, key))])
+
+    def pop(self, key, *default):
+        """ remove key and return its value (or default, if given and key is absent). If
+        pre_remove function raises Abort, key stays in the dict but its value is still returned
+        """
+        if not self._hooks.removes or key not in self:
+            return dict.pop(self, key, *default)
+        value = dict.__getitem__(self, key)
+        self._remove_pairs([(key, value)])
+        return value
+
+    def popitem(self):
+        """ remove and return the last added (key, value) pair. If pre_remove function raises
+        Abort, the pair stays in the dict but is still returned
+        """
+        if not self._hooks.removes:
+            return dict.popitem(self)
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(self))
+        pair = (key, dict.__getitem__(self, key))
+        self._remove_pairs([pair])
+        return pair
+
+    def setdefault(self, key, default=None):
+        """ return d[key], first setting it to default (through the add hooks) if key is absent.
+        If pre_add raises Abort, default is returned without being added
+        """
+        if key not in self:
+            self[key] = default
+            return default
+        return dict.__getitem__(self, key)
+
+    def clear(self):
+        """ remove all keys, except those whose pre_remove function raises Abort """
+        if not self._hooks.removes:
+            return dict.clear(self)
+        self._remove_pairs(list(self.items()))
+
+    def update(self, *args, **kwargs):
+        """ update from a mapping or iterable of pairs, and keyword arguments, like dict.update.
+        Keys already present go through the replace hooks, new keys through the add hooks
+        """
+        hooks = self._hooks
+        if not hooks.adds and not hooks.replaces:
+            return dict.update(self, *args, **kwargs)
+        incoming = dict(*args, **kwargs)
+        replaced = [(key, dict.__getitem__(self, key), value) for key, value in incoming.items()
+                    if key in self]
+        replaced = [(key, old, value) for key, old, value in replaced
+                    if not self._hook_fxn_aborts('pre_replace', key, old, value)]
+        added = self._accepted_adds([(key, value) for key, value in incoming.items()
+                                     if key not in self])
+        dict.update(self, ((key, value) for key, _, value in replaced))
+        dict.update(self, added)
+        for key, old, value in replaced:
+            self._call_post_hook_fxn('post_replace', key, old, value)
+        if added:
+            self._call_post_add_hooks(added)
+
+    def _remove_pairs(self, pairs):
+        """ call pre_remove for each (key, value) of pairs, natively delete the keys not aborted,
+        then call post_remove for each deleted pair
+        """
+        removed = [(key, value) for key, value in pairs
+                   if not self._hook_fxn_aborts('pre_remove', key, value)]
+        for key, _ in removed:
+            dict.__delitem__(self, key)
+        for key, value in removed:
+            self._call_post_hook_fxn('post_remove', key, value)
+
+    def _accepted_adds(self, pairs):
+        """ like List._accepted_adds, but calls pre_add with key and value """
+        hooks = self._hooks
+        if hooks.pre_add_many is None and hooks.pre_add is not None:
+            return [(key, value) for key, value in pairs
+                    if not self._hook_fxn_aborts('pre_add', key, value)]
+        return super()._accepted_adds(pairs)
+
+    def _call_post_add_hooks(self, added):
+        """ like List._call_post_add_hooks, but calls post_add with key and value """
+        if self._hooks.post_add_many is not None:
+            return super()._call_post_add_hooks(added)
+        if self._hooks.post_add is None:
+            return
+        for key, value in added:
+            self._call_post_hook_fxn('post_add', key, value)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+def _restore_array(cls, typecode, data):
+    """ unpickle a hookedup Array (see Array.__reduce_ex__). data is any buffer of its bytes """
+    restored = cls(typecode)
+    with memoryview(data) as view:
+        array.array.frombytes(restored, view.cast('B'))
+    return restored
+
+
+class Array(_HookedSequence, array.array):
+    """ a hookedup sequence of numbers stored unboxed in an array.array, with the same hooks as
+    List (except the move hooks). Single-item operations call pre_add / pre_remove /
+    pre_replace with the item, as List does. Bulk adds (extend, fromlist, frombytes, fromfile,
+    fromunicode, +=, *= and inserting through slice assignment) first convert all new items to one
+    array of this typecode, then call pre_add_many once with a read-only memoryview of it. Unlike
+    List's, Array's pre_add_many returns None or True to accept every item, False to accept none,
+    an int n to accept the first n items, or a mask with one true or false entry per item (a
+    list, bytes, or any sequence of booleans, such as a NumPy bool array); raising Abort accepts
+    none. The accepted items are
+    appended with one native array extend (a memory copy) and passed to post_add_many as a
+    read-only memoryview. Extending from an object that exports a buffer of this typecode's
+    format (another array, or a NumPy array of the same dtype) copies the buffer without boxing
+    a single item.
+    """
+    __slots__ = _HOOKED_SLOTS
+    _hook_names = tuple(name for name in HOOK_NAMES if not name.endswith('_move'))
+    _hookedup_name = 'Array'
+
+    def __new__(cls, typecode, initializer=(), **kwargs):
+        return super().__new__(cls, typecode, initializer)
+
+    def __init__(self, typecode, initializer=(), **kwargs):
+        """ init an array of typecode from an optional initializer, with pre- and post- hooks given
+        as keywords
+        """
+        super().__init__()
+        self._init_hooks(kwargs)
+
+    def __reduce_ex__(self, protocol):
+        """ pickle the array's memory in native byte order: with protocol 5 as a PickleBuffer,
+        which pickle.dumps can hand out of band (buffer_callback) without copying, otherwise as
+        bytes. Hooks are pickled by name, as for List
+        """
+        data = pickle.PickleBuffer(self) if protocol >= 5 else self.tobytes()
+        return _restore_array, (type(self), self.typecode, data), self._pickled_hooks()
+
+    def __copy__(self):
+        """ Returns: a new Array with the same items and hooks (array.array's would lose them) """
+        copied = _restore_array(type(self), self.typecode, self)
+        copied.set_hooks(**self._installed_hooks())
+        return copied
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def _as_array(self, items):
+        """ Returns: items as an array.array of this typecode, copying a buffer of the same format
+        in one step and converting anything else item by item. Raises TypeError as
+        array.extend does for an array of another typecode
+        """
+        if isinstance(items, array.array):
+            if items.typecode != self.typecode:
+                raise TypeError('can only extend with array of same kind')
+            return items
+        converted = array.array(self.typecode)
+        try:
+            view = memoryview(items)
+        except TypeError:
+            converted.extend(items)
+            return converted
+        with view:
+            if view.format == self.typecode and view.c_contiguous:
+                converted.frombytes(view.cast('B'))
+            else:
+                converted.extend(view.tolist())
+        return converted
+
+    def _accepted_adds(self, items):
+        """ run pre_add_many once (or pre_add for each item, if there is no batch hook) on items,
+        an array of this typecode
+        Returns: array of the items accepted for adding
+        """
+        hooks = self._hooks
+        if hooks.pre_add_many is None:
+            if hooks.pre_add is None:
+                return items
+            return array.array(self.typecode, [item for item in items
+                                               if not self._hook_fxn_aborts('pre_add', item)])
+        try:
+            verdict = hooks.pre_add_many(self, memoryview(items).toreadonly())
+        except Abort:
+            verdict = ABORT
+        if verdict is ABORT or verdict is False:
+            self._abort_stats['pre_add_many'] += 1
+            return array.array(self.typecode)
+        if verdict is None or verdict is True:
+            return items
+        if isinstance(verdict, int):
+            return items[:max(verdict, 0)]
+        if not isinstance(verdict, collections.abc.Sized):
+            raise TypeError('pre_add_many must return None, a bool, an int, a mask or ABORT, not ' +
+                            type(verdict).__name__)
+        if len(verdict) != len(items):
+            raise ValueError('pre_add_many mask has ' + str(len(verdict)) + ' entries for ' +
+                             str(len(items)) + ' items')
+        return array.array(self.typecode, itertools.compress(items, verdict))
+
+    def _call_post_add_hooks(self, added):
+        """ run post_add_many once with a read-only memoryview of added (or post_add for each item,
+        if there is no batch hook)
+        """
+        if self._hooks.post_add_many is not None:
+            self._call_post_hook_fxn('post_add_many', memoryview(added).toreadonly())
+        elif self._hooks.post_add is not None:
+            for item in added:
+                self._call_post_hook_fxn('post_add', item)
+
+    def _add_many(self, items):
+        """ append items (an array of this typecode) in one native extend, after the pre hooks """
+        accepted = self._accepted_adds(items)
+        if accepted:
+            array.array.extend(self, accepted)
+            self._call_post_add_hooks(accepted)
+
+    def append(self, item):
+        """ append item to end of array, unless pre_add function raises Abort """
+        if not self._hooks.adds:
+            return array.array.append(self, item)
+        item = array.array(self.typecode, (item,))[0]  # raise TypeError before any hook runs
+        if not self._hook_fxn_aborts('pre_add', item):
+            array.array.append(self, item)
+            self._call_post_hook_fxn('post_add', item)
+
+    def insert(self, index, item):
+        """ insert item into array at given index, unless pre_add function raises Abort """
+        if not self._hooks.adds:
+            return array.array.insert(self, index, item)
+        item = array.array(self.typecode, (item,))[0]
+        if not self._hook_fxn_aborts('pre_add', item):
+            array.array.insert(self, index, item)
+            self._call_post_hook_fxn('post_add', item)
+
+    def extend(self, items):
+        """ append items, calling the add hooks once for all of them (see class doc) """
+        if not self._hooks.adds:
+            return array.array.extend(self, items)
+        self._add_many(self._as_array(items))
+
+    def fromlist(self, items):
+        if not self._hooks.adds:
+            return array.array.fromlist(self, items)
+        if not isinstance(items, list):
+            raise TypeError('arg must be list')
+        self._add_many(array.array(self.typecode, items))
+
+    def frombytes(self, buffer):
+        if not self._hooks.adds:
+            return array.array.frombytes(self, buffer)
+        items = array.array(self.typecode)
+        items.frombytes(buffer)
+        self._add_many(items)
+
+    def fromfile(self, f, n):
+        """ read n items from file object f and append them. If f holds fewer, the items read are
+        still added (through the hooks) before EOFError is raised, as array.fromfile does
+        """
+        if not self._hooks.adds:
+            return array.array.fromfile(self, f, n)
+        items = array.array(self.typecode)
+        try:
+            items.fromfile(f, n)
+        finally:
+            self._add_many(items)
+
+    def fromunicode(self, string):
+        if not self._hooks.adds:
+            return array.array.fromunicode(self, string)
+        items = array.array(self.typecode)
+        items.fromunicode(string)
+        self._add_many(items)
+
+    def __iadd__(self, items):
+        if not self._hooks.adds:
+            return array.array.__iadd__(self, items)
+        if not isinstance(items, array.array):
+            raise TypeError('can only extend array with array (not "' + type(items).__name__ +
+                            '")')
+        self.extend(items)
+        return self
+
+    def __imul__(self, multiplier):
+        hooks = self._hooks
+        if not hooks.adds and not hooks.removes:
+            return array.array.__imul__(self, multiplier)
+        if multiplier <= 0:
+            del self[:]
+        elif multiplier > 1:
+            self._add_many(array.array(self.typecode, self) * (multiplier - 1))
+        return self
+
+    def pop(self, index=-1):
+        """ Pop item @ index (or end of array if not supplied). If pre_remove function raises
+        Abort, item will not be removed, but is still returned
+        """
+        if not self._hooks.removes:
+            return array.array.pop(self, index)
+        if not self:
+            raise IndexError('pop from empty array')
+        self._verify_index_bounds(index, 'pop')
+        item = self[index]
+        if not self._hook_fxn_aborts('pre_remove', item):
+            array.array.pop(self, index)
+            self._call_post_hook_fxn('post_remove', item)
+        return item
+
+    def remove(self, item):
+        """ remove first instance of item from array, unless pre_remove function raises Abort """
+        if not self._hooks.removes:
+            return array.array.remove(self, item)
+        try:
+            index = self.index(item)
+        except ValueError:
+            raise ValueError('array.remove(x): x not in array') from None
+        self.pop(index)
+
+    def __delitem__(self, index):
+        """ delete the item at index, or the items of a slice, calling pre_remove for each item
+        first. Items whose pre_remove raises Abort stay; the rest are removed in one native pass
+        """
+        if not self._hooks.removes:
+            return array.array.__delitem__(self, index)
+        if not isinstance(index, slice):
+            self._verify_index_bounds(index, 'array assignment')
+            self.pop(index)
+            return
+        positions = range(*index.indices(len(self)))
+        removed = [position for position in positions
+                   if not self._hook_fxn_aborts('pre_remove', self[position])]
+        if not removed:
+            return
+        items = [self[position] for position in removed]
+        if len(removed) == len(positions):
+            array.array.__delitem__(self, index)
+        else:
+            low, high = min(removed), max(removed) + 1
+            gone = set(removed)
+            survivors = array.array(self.typecode, (item for position, item in
+                                                    enumerate(self[low:high], low)
+                                                    if position not in gone))
+            array.array.__setitem__(self, slice(low, high), survivors)
+        for item in items:
+            self._call_post_hook_fxn('post_remove', item)
+
+    def __setitem__(self, index, replacement):
+        """ replace the item at index (or the items of a slice, with an array of the same
+        typecode) as List.__setitem__ does: pre_replace for replaced items, pre_remove for items
+        the slice loses and the add hooks for items it gains, then one native write
+        """
+        hooks = self._hooks
+        hooked = hooks.replaces if not isinstance(index, slice) else (hooks.replaces or
+                                                                      hooks.adds or hooks.removes)
+        if not hooked:
+            return array.array.__setitem__(self, index, replacement)
+        if not isinstance(index, slice):
+            self._verify_index_bounds(index, 'array assignment')
+            item = self[index]
+            replacement = array.array(self.typecode, (replacement,))[0]
+            if not self._hook_fxn_aborts('pre_replace', item, replacement):
+                array.array.__setitem__(self, index, replacement)
+                self._call_post_hook_fxn('post_replace', item, replacement)
+            return
+        if not isinstance(replacement, array.array):
+            raise TypeError('can only assign array (not "' + type(replacement).__name__ +
+                            '") to array slice')
+        replacement = self._as_array(replacement)
+        current = self[index]
+        self._verify_slices_are_valid(index, current, replacement)
+        replaced, removed, added, contents = self._decide_slice_assignment(current, replacement)
+        contents = array.array(self.typecode, contents)
+        if index.step is None or index.step == 1:
+            start = range(*index.indices(len(self))).start
+            index = slice(start, start + len(current))
+        array.array.__setitem__(self, index, contents)
+        for item, replacing_item in replaced:
+            self._call_post_hook_fxn('post_replace', item, replacing_item)
+        for item in removed:
+            self._call_post_hook_fxn('post_remove', item)
+        if added:
+            self._call_post_add_hooks(added)
+
+
+class PreventOverwriteProperty:
+    """ descriptor that gives each owner its own hookedup List, created the first time the owner
+    accesses it and the same list every time after that. The list is stored on the owner itself,
+    so it is reclaimed together with the owner. Assigning anything but the owner's own list (as
+    += and *= do) raises AttributeError.
+    class Club:
+        members = PreventOverwriteProperty(**hooks)
+    Owners without a __dict__ (using __slots__) have their list kept in a WeakKeyDictionary instead.
+    Pass container=hookedup.Set or container=hookedup.Dict to give each owner a hooked set or dict.
+    """
+
+    def __init__(self, *args, container=None, **kwargs):
+        """ args and kwargs are passed to container (hookedup.List by default) for each owner's
+        container
+        """
+        self._container = List if container is None else container
+        self._args = args
+        self._kwargs = kwargs
+        self._attr_name = '_PreventOverwriteProperty__' + str(id(self))
+        self._slotted_owners = weakref.WeakKeyDictionary()
+
+    def __set_name__(self, owner_cls, name):
+        self._attr_name = '_PreventOverwriteProperty__' + name
+
+    def __get__(self, owner, owner_cls=None):
+        if owner is None:
+            return self
+        try:
+            return owner.__dict__[self._attr_name]
+        except KeyError:
+            L = owner.__dict__[self._attr_name] = self._container(*self._args, **self._kwargs)
+            return L
+        except AttributeError:
+            pass
+        try:
+            return self._slotted_owners[owner]
+        except KeyError:
+            L = self._slotted_owners[owner] = self._container(*self._args, **self._kwargs)
+            return L
+
+    def __set__(self, owner, value):
+        if value is not self.__get__(owner):
+            raise AttributeError("can't set attribute")
+
+    @classmethod
+    def setup(cls, *args, **kwargs):
+        """setup for property(). Inside a separate class, call
+        property(PreventOverwriteProperty.setup(L, **hooks)) where 
+        L is a premade list you want each time, and **hooks is a dictionary of
+        the hooks you want installed in the list. Each time an owner accesses
+        it's list, it will get the same list (created the first time it's
+        accessed, and stored on the owner each time after that)
+        """
+        return cls(*args, **kwargs).__get__
+
+
+class PreventHookedupOverwriteReset:
+    """ inherit from this to prevent a hookedup List from being overwritten and/or reset. When user
+    attempts to set attribute of inheriting class, if attribute already on class is a hookedup
+    List, this raises AttributeError (unless it is the same object, as a case would be when using
+    *= or +=). User instead should use.clear() to attempt to clear attribute and then update it 
+    accordingly.
+    for example:
+    Class Example(PreventHookedupOverwriteReset):
+        pass
+    a = A()
+    a.list = hookedup.List()  # a.list cannot be reset or set to anything else once it has been set
+                              # to hookedup.List
+    a.list = []  # raises AttributeError
+    a.list = hookedup.List()  # also raises AttributeError
+    hookedup Set and Dict attributes are protected the same way.
+    Only names that have ever held a hookedup List, Set or Dict on the class (or any of its
+    instances) are checked. Assigning to any other name costs a single isinstance check, plus a
+    class attribute lookup the first time an instance assigns it (which catches hookedup class
+    attributes assigned after the class was created).
+    """
+    _hookedup_attr_names = set()
+    _next_setattr = object.__setattr__
+
+    def __init_subclass__(cls, **kwargs):
+        """ give each subclass its own set of checked names, starting with the names its bases
+        check and the names of class attributes that are hookedup Lists. Also look up the
+        __setattr__ that follows this class in the subclass's MRO, so unchecked assignments can
+        call it directly instead of through super()
+        """
+        super().__init_subclass__(**kwargs)
+        names = set()
+        for klass in cls.__mro__:
+            names.update(getattr(klass, '_hookedup_attr_names', ()))
+            names.update(name for name, value in vars(klass).items() if isinstance(value, _Hooked))
+        cls._hookedup_attr_names = names
+        following = cls.__mro__[cls.__mro__.index(PreventHookedupOverwriteReset) + 1:]
+        cls._next_setattr = next(vars(klass)['__setattr__'] for klass in following
+                                 if '__setattr__' in vars(klass))
+
+    def __setattr__(self, attr_name, attr):
+        cls = type(self)
+        if attr_name not in cls._hookedup_attr_names:
+            if attr_name in self.__dict__ or not isinstance(getattr(cls, attr_name, None), _Hooked):
+                if isinstance(attr, _Hooked):
+                    cls._hookedup_attr_names.add(attr_name)
+                cls._next_setattr(self, attr_name, attr)
+                return
+            cls._hookedup_attr_names.add(attr_name)  # class attribute set after class creation
+        try:
             original = getattr(self, attr_name)
         except AttributeError:
             super().__setattr__(attr_name, attr)  # allow setting attribute first time
@@ -284,11 +2485,8 @@ class PreventHookedupOverwriteReset:
         if original is attr:
             super().__setattr__(attr_name, attr)  # allows __iadd__ (+=) and __imul__ (*=) to work
             return
-        for hookedType in (List,):
+        for hookedType in (List, Set, Dict, Array):
             if isinstance(original, hookedType):
                 raise AttributeError('Overwriting attribute "' + attr_name + '" of type ' +
                                      str(hookedType) + 'prohibited')
         super().__setattr__(attr_name, attr)
-
-
-
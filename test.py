@@ -1,6 +1,20 @@
 import unittest
+import abc
+import array
 import hookedup
 import random
+import threading
+import concurrent.futures
+import asyncio
+import gc
+import sys
+import collections
+import collections.abc
+import copy
+import functools
+import operator
+import pickle
+import weakref
 
 class TestListUnimplementedParts(unittest.TestCase):
     """ verify that these unimplemented methods do not return a hookedup.List instance; only a list
@@ -137,6 +151,54 @@ class TestHookedupList(unittest.TestCase):
             self.assertTrue(L2 == self.original)
             self.assertTrue(difference == self.count)
 
+    def test_replacement_slices_with_partial_aborts(self):
+        """ verify that slice assignment keeps items whose pre hooks abort, commits the rest, and
+        calls post hooks in replace, remove, add order after all pre hooks
+        """
+        calls = []
+        record = lambda name: lambda L, *args: calls.append((name,) + args)
+        abort_odd = lambda L, item, *_: item % 2 and self.raise_abort()
+        hooks = {'pre_replace': abort_odd, 'pre_remove': abort_odd,
+                 'pre_add': lambda L, item: item % 2 and self.raise_abort(),
+                 'post_replace': record('replace'), 'post_remove': record('remove'),
+                 'post_add': record('add')}
+        L = hookedup.List(range(8), **hooks)
+        L[1:6] = [10, 11]  # replace 1 & 2, remove 3, 4, 5 (3 & 5 abort)
+        self.assertTrue(L == [0, 1, 11, 3, 5, 6, 7])
+        self.assertTrue(calls == [('replace', 2, 11), ('remove', 4)])
+        calls.clear()
+        L[5:6] = [20, 21, 22, 23]  # replace 6 with 20, add 21 (aborted), 22, 23 (aborted)
+        self.assertTrue(L == [0, 1, 11, 3, 5, 20, 22, 7])
+        self.assertTrue(calls == [('replace', 6, 20), ('add', 22)])
+        calls.clear()
+        L[::-2] = [30, 31, 32, 33]  # extended slice over 7, 20, 3, 1 (odd items abort)
+        self.assertTrue(L == [0, 1, 11, 3, 5, 31, 22, 7])
+        self.assertTrue(calls == [('replace', 20, 31)])
+
+    def test_delitem_slice_partial_abort(self):
+        """ verify that deleting slices while pre_remove aborts for some items keeps exactly those
+        items, and that hooks fire in slice order
+        """
+        keep_odd = lambda L, item: item % 2 and self.raise_abort()
+        slices = [slice(1, 8), slice(0, 9, 3), slice(8, 1, -2), slice(None, None, -1), slice(5, 2)]
+        for s in slices:
+            removed = []
+            L = hookedup.List(range(10), pre_remove=keep_odd,
+                              post_remove=lambda L, item: removed.append(item))
+            expected_removed = [x for x in list(range(10))[s] if x % 2 == 0]
+            del L[s]
+            self.assertTrue(removed == expected_removed)
+            self.assertTrue(L == [x for x in range(10) if x not in expected_removed])
+
+    def test_clear_large_list_with_aborts(self):
+        removed = []
+        L = hookedup.List(range(200000), pre_remove=lambda L, item: item % 3 or self.raise_abort(),
+                          post_remove=lambda L, item: removed.append(item))
+        L.clear()
+        self.assertTrue(L == list(range(0, 200000, 3)))
+        self.assertTrue(len(removed) == 200000 - len(L))
+        self.assertTrue(L._abort_stats['pre_remove'] == len(L))
+
     def test_clear(self):
         L2 = hookedup.List(self.list, pre_remove=self.increment_and_abort)
         self.assertTrue(self.L == self.list == L2)
@@ -159,6 +221,67 @@ class TestHookedupList(unittest.TestCase):
         self.assertTrue(self.count == len(self.list))
         self.assertTrue(len(L) == 0)
 
+    def test_batch_add_hooks(self):
+        """ verify that extend, +=, *= and slice insertion call batch hooks once per operation and
+        commit only the items accepted by pre_add_many
+        """
+        batches = []
+        evens_only = lambda L, items: [x for x in items if x % 2 == 0]
+        record = lambda L, added: batches.append(list(added))
+        L = hookedup.List(pre_add_many=evens_only, post_add_many=record,
+                          pre_add=self.increment_and_abort)
+        L.extend(range(6))
+        self.assertTrue(L == [0, 2, 4])
+        self.assertTrue(batches == [[0, 2, 4]])
+        self.assertTrue(self.count == 0)  # per-item pre_add is not used when batch hook exists
+        L += [6, 7]
+        L *= 2
+        self.assertTrue(L == [0, 2, 4, 6] * 2)
+        L[1:1] = [10, 11, 12]
+        self.assertTrue(L == [0, 10, 12, 2, 4, 6, 0, 2, 4, 6])
+        self.assertTrue(len(batches) == 4)
+        L2 = hookedup.List(pre_add_many=self.raise_abort, post_add_many=record)
+        L2.extend(range(3))
+        self.assertTrue(L2 == [] and len(batches) == 4)
+        self.assertTrue(L2._abort_stats['pre_add_many'] == 1)
+
+    def test_batch_hook_falls_back_to_per_item_hook(self):
+        """ with only post_add_many installed, per-item pre_add still decides each item """
+        added = []
+        L = hookedup.List(pre_add=lambda L, x: x > 1 or self.raise_abort(),
+                          post_add_many=lambda L, items: added.append(items))
+        L.extend(range(4))
+        self.assertTrue(L == [2, 3])
+        self.assertTrue(added == [[2, 3]])
+
+    def test_insert(self):
+        self.L.insert(1, -1)
+        self.list.insert(1, -1)
+        self.assertTrue(self.L == self.list)
+        L2 = hookedup.List(self.original, pre_add=self.increment_and_abort)
+        L2.insert(1, -1)
+        self.assertTrue(L2 == self.original)
+        self.assertTrue(self.count == 1)
+
+    def test_set_hooks_reselects_hooked_operations(self):
+        """ verify hooks installed or removed at runtime take effect on the next operation """
+        L = hookedup.List(self.original)
+        L.set_hooks(pre_add=self.increment_and_abort, post_remove=self.increment_count)
+        L.append(4)
+        L.extend([5, 6])
+        L.pop()
+        self.assertTrue(L == self.original[:-1])
+        self.assertTrue(self.count == 4)
+        L.set_hooks(pre_add=None)
+        L.append(4)
+        L += [5]
+        self.assertTrue(L == [0, 1, 2, 4, 5])
+        self.assertTrue(self.count == 4)
+        L.set_hooks(post_remove=None)
+        del L[0:2]
+        L.clear()
+        self.assertTrue(L == [] and self.count == 4)
+
     def test_list_inits_with_empty_hook_or_no_hook(self):
         L = hookedup.List(**{})
         L = hookedup.List()
@@ -242,11 +365,1064 @@ class TestHookedupList(unittest.TestCase):
                 successes += not had_error
         self.assertTrue(successes > 0 and errors > 0)
 
+    def test_move_to_calls_move_hooks_or_falls_back(self):
+        calls = []
+        record = lambda name: lambda L, *args: calls.append((name, L, args))
+        src = hookedup.List([1, 2, 3], pre_move=record('pre_move'), post_move=record('post_move'))
+        dst = hookedup.List([7], pre_add=record('pre_add'), post_add=record('post_add'))
+        self.assertTrue(src.move_to(dst, 2, 0) == 3)
+        src.move_to(dst, -1)
+        self.assertTrue(src == [1] and dst == [3, 7, 2])
+        self.assertTrue(calls[:2] == [('pre_move', src, (3, src, dst)), ('pre_add', dst, (3,))])
+        self.assertTrue(calls[2:4] == [('post_move', src, (3, src, dst)), ('post_add', dst, (3,))])
+        del calls[:]
+        dst.move_to(dst, 0, 0)  # an int is an index: moves dst[0] to the front again
+        src.move_to(src, 0)
+        self.assertTrue(dst == [3, 7, 2] and src == [1])
+        self.assertTrue([name for name, *_ in calls] == ['pre_add', 'post_add', 'pre_move',
+                                                         'post_move'])
+        self.assertRaises(IndexError, src.move_to, dst, 5)
+        self.assertRaises(ValueError, src.move_to, dst, 'absent')
+
+    def test_move_to_requires_both_or_neither_list_in_transaction(self):
+        a, b = hookedup.List([1, 2, 3]), hookedup.List([9])
+        for lst in (a, b):
+            with lst.transaction():
+                self.assertRaises(RuntimeError, a.move_to, b, 0)
+                raise hookedup.Abort()
+            self.assertTrue(a == [1, 2, 3] and b == [9])
+        with a.transaction(), b.transaction():
+            a.move_to(b, 0)
+        self.assertTrue(a == [2, 3] and b == [9, 1])
+
+    def test_move_to_abort_leaves_both_lists_unchanged(self):
+        def refuse(L, item, *_):
+            if item == 'b':
+                raise hookedup.Abort()
+        moved = []
+        src = hookedup.List(['a', 'b'], pre_remove=refuse, post_remove=lambda L, x: moved.append(x))
+        dst = hookedup.List(['c'], indexed=True, pre_add=lambda L, x: moved.append(x))
+        self.assertTrue(src.move_to(dst, 'b') == 'b')
+        self.assertTrue(src == ['a', 'b'] and dst == ['c'] and moved == [])
+        src.set_hooks(pre_remove=None)
+        dst.set_hooks(pre_move=refuse)
+        src.move_to(dst, 'b')
+        self.assertTrue(src == ['a', 'b'] and dst == ['c'])
+        src.move_to(dst, 'a', 0)
+        self.assertTrue(src == ['b'] and dst == ['a', 'c'] and 'a' in dst)
+        for not_a_list in (hookedup.Set(), []):
+            self.assertRaises(TypeError, src.move_to, not_a_list, 'b')
+        self.assertTrue(src == ['b'] and moved == ['a'])
+
+    def test_lists_with_same_hooks_share_one_profile(self):
+        callback = {'pre_add': print, 'post_remove': print}
+        a, b = hookedup.List(**callback), hookedup.List([1], **callback)
+        self.assertTrue(a._hooks is b._hooks and a._abort_counts is None)
+        self.assertFalse(hasattr(a, '__dict__'))
+        b.set_hooks(post_remove=None)
+        self.assertTrue(a._hooks is not b._hooks and a._hooks.post_remove is print)
+        self.assertTrue(hookedup.List(range(3))._hooks is hookedup.List()._hooks)
+
+    def test_equal_hooks_do_not_share_a_profile(self):
+        class Owner:
+            def __init__(self):
+                self.rejected = []
+
+            def __eq__(self, other):
+                return True
+
+            def __hash__(self):
+                return 0
+
+            def __call__(self, L, item):
+                self.rejected.append(item)
+                return hookedup.ABORT
+
+        first, second = Owner(), Owner()
+        a, b = hookedup.List(pre_add=first), hookedup.List(pre_add=second)
+        a.append(1)
+        b.append(2)
+        self.assertTrue(a._hooks is not b._hooks)
+        self.assertTrue(first.rejected == [1] and second.rejected == [2])
+        for make_hook in (lambda owner: owner.__call__,
+                          lambda owner: lambda L, item: owner(L, item),
+                          lambda owner: functools.partial(Owner.__call__, owner)):
+            owner = Owner()
+            hookedup.List(pre_add=make_hook(owner))
+            owner = weakref.ref(owner)
+            gc.collect()
+            self.assertTrue(owner() is None)  # not kept alive by recently built profiles
+
+    def test_returning_abort_sentinel_aborts_like_raising(self):
+        reject_odd = lambda L, item, *_: hookedup.ABORT if item % 2 else None
+        L = hookedup.List(pre_add=reject_odd, pre_remove=reject_odd, pre_replace=reject_odd)
+        stats = L.enable_hook_stats()
+        L.extend(range(6))
+        L.append(7)
+        L[0:2] = [8, 9, 1]
+        L.clear()  # pre_replace checked the replaced items, so 9 is in L, and pre_remove keeps it
+        self.assertTrue(L == [9] and stats.snapshot()['pre_add']['aborts'] == 5)
+        self.assertTrue(L._abort_stats['pre_add'] == 5 and repr(hookedup.ABORT) == 'hookedup.ABORT')
+        L.set_hooks(pre_add_many=lambda L, items: hookedup.ABORT)
+        L.extend([2, 4])
+        A = hookedup.Array('i', pre_add_many=lambda A, view: hookedup.ABORT)
+        A.extend([2, 4])
+        self.assertTrue(L == [9] and len(A) == 0)
+
+
+
+class TestTransaction(unittest.TestCase):
+    """ verify that a transaction defers post hooks until it ends, and restores the list without
+    calling post hooks when the block raises
+    """
+
+    def setUp(self):
+        self.calls = []
+        record = lambda name: lambda L, *args: self.calls.append((name,) + args)
+        hooks = {'post_add': record('add'), 'post_remove': record('remove'),
+                 'post_replace': record('replace'),
+                 'pre_add': lambda L, item: item < 0 and self.raise_abort()}
+        self.L = hookedup.List(range(4), **hooks)
+
+    def raise_abort(self, *_):
+        raise hookedup.Abort()
+
+    def test_post_hooks_run_after_block(self):
+        with self.L.transaction() as L:
+            L.append(4)
+            L.append(-1)  # aborted by pre_add as usual
+            L[0] = 9
+            del L[1:3]
+            self.assertTrue(L == [9, 3, 4])
+            self.assertTrue(self.calls == [])
+        self.assertTrue(self.L == [9, 3, 4])
+        self.assertTrue(self.calls == [('add', 4), ('replace', 0, 9), ('remove', 1),
+                                       ('remove', 2)])
+        self.L.append(5)
+        self.assertTrue(self.calls[-1] == ('add', 5))
+
+    def test_exception_rolls_back(self):
+        with self.assertRaises(KeyError):
+            with self.L.transaction() as L:
+                L.extend([4, 5])
+                L.pop(0)
+                raise KeyError()
+        self.assertTrue(self.L == [0, 1, 2, 3] and self.calls == [])
+        with self.L.transaction() as L:
+            L.clear()
+            raise hookedup.Abort()  # rolls back silently
+        self.assertTrue(self.L == [0, 1, 2, 3] and self.calls == [])
+
+    def test_failing_post_hook_does_not_skip_the_rest(self):
+        def record_reciprocal(L, item):
+            self.calls.append(item)
+            return 1 / item
+        L = hookedup.List(post_add=record_reciprocal)
+        with self.assertRaises(ZeroDivisionError), L.transaction():
+            L.extend([1, 0, 2])
+            L.append(0)
+        self.assertTrue(L == [1, 0, 2, 0] and self.calls == [1, 0, 2, 0])
+
+    def test_nested_transaction_is_savepoint(self):
+        with self.L.transaction() as L:
+            L.append(4)
+            with L.transaction():
+                L.append(5)
+                raise hookedup.Abort()
+            self.assertTrue(L == [0, 1, 2, 3, 4])
+            with L.transaction():
+                L.append(6)
+        self.assertTrue(self.L == [0, 1, 2, 3, 4, 6])
+        self.assertTrue(self.calls == [('add', 4), ('add', 6)])
+
+    def test_rollback_undoes_only_the_changes(self):
+        L = hookedup.List(range(100000))
+        with L.transaction():
+            L.append(-1)
+            L[5:7] = 'abc'
+            with L.transaction():
+                L.reverse()
+                del L[::1000]
+                raise hookedup.Abort()
+            self.assertTrue(L[4:9] == [4, 'a', 'b', 'c', 7] and L[-1] == -1)
+            undo = L._transaction.undo
+            self.assertTrue(sum(len(items) for *_, items in undo.entries) == 2)
+            L.sort(key=str)
+            raise hookedup.Abort()
+        self.assertTrue(L == list(range(100000)) and L._trackers == ())
+
+    def test_rollback_keeps_index_consistent(self):
+        L = hookedup.List(range(4), indexed=True)
+        with L.transaction():
+            L.remove(2)
+            L.append(7)
+            self.assertTrue(7 in L and 2 not in L)
+            raise hookedup.Abort()
+        self.assertTrue(2 in L and 7 not in L and L == [0, 1, 2, 3])
+
+
+class TestJournal(unittest.TestCase):
+    """ verify that a replica kept in sync by replaying the journal matches the List, and that
+    runs of related changes are coalesced into single ops
+    """
+
+    def test_replica_follows_random_operations(self):
+        rng = random.Random(15)
+        abort_7 = lambda L, item, *_: item == 7 and self.raise_abort()
+        L = hookedup.List(range(20), pre_add=abort_7, pre_remove=abort_7)
+        journal = L.enable_journal()
+        self.assertTrue(L.enable_journal() is journal and L.journal is journal)
+        replica, cursor = list(L), journal.cursor()
+        operations = [lambda: L.append(rng.randrange(10)), lambda: L.extend(range(3)),
+                      lambda: L.insert(rng.randrange(-5, 30), 1), lambda: L and L.pop(),
+                      lambda: L and L.pop(0), lambda: 7 in L and L.remove(7),
+                      lambda: L.__setitem__(slice(2, 6), [rng.randrange(10)] * 3),
+                      lambda: L.__setitem__(slice(None, None, 3), L[::3][::-1]),
+                      lambda: L.__delitem__(slice(1, 8, 2)), lambda: L.__imul__(2),
+                      lambda: L and L.__setitem__(0, 9), lambda: L.clear(),
+                      lambda: L.sort(), lambda: L.reverse()]
+        for step in range(500):
+            rng.choice(operations)()
+            if rng.random() < 0.3:
+                hookedup.replay(replica, cursor)
+                self.assertTrue(replica == L)
+                journal.trim()
+        hookedup.replay(replica, cursor)
+        self.assertTrue(replica == L)
+
+    def raise_abort(self, *_):
+        raise hookedup.Abort()
+
+    def test_cursor_reads_changes_merging_with_earlier_ops(self):
+        L = hookedup.List([0], post_add=lambda *_: None)
+        journal = L.enable_journal()
+        L.append(1)
+        replica, cursor = list(L), journal.cursor()
+        L.append(2)
+        L.append(3)
+        self.assertTrue(hookedup.replay(replica, cursor) == L == [0, 1, 2, 3])
+        self.assertTrue(len(journal.ops) == 2)
+
+    def test_runs_are_coalesced_until_read(self):
+        L = hookedup.List(range(10), post_add=lambda *_: None)
+        journal = L.enable_journal()
+        cursor = journal.cursor()
+        for i in range(100):
+            L.append(i)
+        for _ in range(3):
+            L.pop(0)
+        for i in range(3):
+            L[i] = -i
+        ops = cursor.read()
+        self.assertTrue([(op.kind, op.start, op.stop) for op in ops] ==
+                        [('insert', 10, 10), ('delete', 0, 3), ('replace', 0, 3)])
+        self.assertTrue(ops[0].items == tuple(range(100)))
+        L.append(1)
+        L.append(2)
+        self.assertTrue(len(cursor.read()) == 1 and cursor.read() == [])
+        replica = list(L)
+        with self.assertRaises(IndexError), L.transaction():
+            L.append(3)
+            raise IndexError()
+        self.assertTrue(hookedup.replay(replica, cursor.read()) == L)
+        journal.trim()
+        self.assertTrue(journal.ops == [])
+        L.disable_journal()
+        L.append(4)
+        self.assertTrue(L.journal is None and cursor.read() == [])
+
+
+class TestChangeNotifications(unittest.TestCase):
+    """ verify that on_change coalesces each operation, each flush or each quiet period into one
+    ChangeSummary, and that sort and reverse are reported as one permutation
+    """
+
+    def setUp(self):
+        self.summaries = []
+        self.L = hookedup.List(range(10), pre_add=lambda L, item: None)
+
+    def notify(self, L, summary):
+        self.summaries.append(summary)
+
+    def test_one_summary_per_operation(self):
+        L = self.L
+        L.on_change(self.notify)
+        L.extend(range(5))
+        L[1:3] = 'abc'
+        L *= 2
+        with L.transaction():
+            L.append(1)
+            L.insert(0, 2)
+            del L[5]
+        self.assertTrue([(s.ranges, s.added, s.removed) for s in self.summaries] ==
+                        [(((10, 15),), 5, 0), (((1, 4),), 3, 2), (((16, 32),), 16, 0),
+                         (((0, 1), (5, 5), (32, 33)), 2, 1)])
+
+    def test_move_is_one_operation(self):
+        L, other = self.L, hookedup.List('ab')
+        L.on_change(self.notify)
+        other.on_change(self.notify)
+        L.move_to(L, 0)
+        L.move_to(other, 2, 1)
+        self.assertTrue(self.summaries == [hookedup.ChangeSummary(((0, 0), (9, 10)), 1, 1, False),
+                                           hookedup.ChangeSummary(((1, 2),), 1, 0, False),
+                                           hookedup.ChangeSummary(((2, 2),), 0, 1, False)])
+
+    def test_sort_and_reverse_are_one_permutation(self):
+        L = self.L
+        subscription = L.on_change(self.notify)
+        journal = L.enable_journal()
+        replica, cursor = list(L), journal.cursor()
+        L.reverse()
+        L.sort(key=lambda item: item % 3)
+        self.assertTrue(self.summaries == [hookedup.ChangeSummary(((0, 10),), 0, 0, True)] * 2)
+        self.assertTrue(hookedup.replay(replica, cursor) == L)
+        subscription.cancel()
+        L.sort()
+        self.assertTrue(len(self.summaries) == 2 and L == list(range(10)))
+
+    def test_manual_flush_merges_and_shifts_ranges(self):
+        L = self.L
+        subscription = L.on_change(self.notify, manual=True)
+        L.append(1)
+        L.insert(0, 5)
+        del L[3]
+        L[4:6] = []
+        self.assertTrue(self.summaries == [])
+        subscription.flush()
+        subscription.flush()
+        ranges = ((0, 1), (3, 3), (4, 4), (8, 9))
+        self.assertTrue(self.summaries == [hookedup.ChangeSummary(ranges, 2, 3, False)])
+
+    def test_debounce_notifies_once_after_quiet_period(self):
+        notified = threading.Event()
+        subscription = self.L.on_change(lambda L, summary: self.notify(L, summary) or
+                                        notified.set(), debounce=0.05)
+        for i in range(1000):
+            self.L.append(i)
+        self.assertTrue(notified.wait(5))
+        self.assertTrue(self.summaries == [hookedup.ChangeSummary(((10, 1010),), 1000, 0, False)])
+        subscription.cancel()
+
+
+class TestHookStats(unittest.TestCase):
+    """ verify that instrumented lists record hook calls, aborts and timings, and that lists
+    without instrumentation call their hooks directly
+    """
+
+    def abort_odd(self, L, item):
+        if item % 2:
+            raise hookedup.Abort()
+
+    def test_per_instance_stats(self):
+        post_add = lambda L, item: None
+        L = hookedup.List(pre_add=self.abort_odd, post_add=post_add)
+        self.assertTrue(L.hook_stats is None and L._hooks.post_add is post_add)
+        stats = L.enable_hook_stats()
+        L.extend(range(5))
+        snapshot = stats.snapshot()
+        self.assertTrue(snapshot['pre_add']['calls'] == 5 and snapshot['pre_add']['aborts'] == 2)
+        self.assertTrue(snapshot['post_add']['calls'] == snapshot['post_add']['sampled'] == 3)
+        self.assertTrue(snapshot['post_add']['max_seconds'] <= snapshot['post_add']['total_seconds'])
+        self.assertTrue(L._abort_stats['pre_add'] == 2)
+        stats.reset()
+        L.append(2)
+        self.assertTrue(stats.snapshot()['pre_add']['calls'] == 1)
+        L.set_hooks(pre_remove=self.abort_odd)
+        L.pop()
+        self.assertTrue(stats.snapshot()['pre_remove']['calls'] == 1)
+        L.disable_hook_stats()
+        self.assertTrue(L._hooks.post_add is post_add)
+
+    def test_sampling_times_every_nth_call(self):
+        L = hookedup.List(post_add=lambda L, item: None)
+        stats = L.enable_hook_stats(sample_every=10)
+        L.extend(range(95))
+        snapshot = stats.snapshot()['post_add']
+        self.assertTrue(snapshot['calls'] == 95 and snapshot['sampled'] == 9)
+
+    def test_global_stats_are_shared(self):
+        stats = hookedup.enable_hook_stats()
+        try:
+            lists = [hookedup.List(pre_add=self.abort_odd) for _ in range(3)]
+        finally:
+            hookedup.disable_hook_stats()
+        for L in lists:
+            L.extend(range(4))
+        self.assertTrue(stats.snapshot()['pre_add']['calls'] == 12)
+        self.assertTrue(stats.snapshot()['pre_add']['aborts'] == 6)
+        self.assertTrue(hookedup.List(pre_add=self.abort_odd).hook_stats is None)
+
+
+class TestAsyncList(unittest.IsolatedAsyncioTestCase):
+    """ verify that AsyncList awaits coroutine hooks with the same Abort semantics as List, and
+    runs the post hooks of bulk operations concurrently within max_concurrency
+    """
+
+    async def asyncSetUp(self):
+        self.added = []
+        self.running = 0
+        self.most_running = 0
+
+    async def abort_odd(self, L, item, *_):
+        await asyncio.sleep(0)
+        if item % 2:
+            raise hookedup.Abort()
+
+    async def slow_post_add(self, L, item):
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        self.added.append(item)
+
+    async def test_returning_abort_sentinel(self):
+        async def reject_odd(L, item):
+            return hookedup.ABORT if item % 2 else None
+        L = hookedup.AsyncList(pre_add=reject_odd)
+        await L.aextend(range(5))
+        await L.aappend(5)
+        L.set_hooks(pre_add_many=lambda L, items: hookedup.ABORT)
+        await L.aextend([6])
+        self.assertTrue(L == [0, 2, 4])
+
+    async def test_single_operations(self):
+        L = hookedup.AsyncList(pre_add=self.abort_odd, post_add=self.slow_post_add,
+                               pre_remove=self.abort_odd)
+        await L.aappend(2)
+        await L.aappend(3)
+        await L.ainsert(0, 4)
+        self.assertTrue(L == [4, 2] and self.added == [2, 4])
+        self.assertTrue(await L.apop() == 2 and L == [4])
+        await L.asetitem(0, 5)
+        self.assertTrue(L == [5])
+        self.assertTrue(await L.apop() == 5 and L == [5])  # 5 is odd: pre_remove aborts
+        with self.assertRaises(ValueError):
+            await L.aremove(7)
+
+    async def test_bulk_post_hooks_run_concurrently(self):
+        L = hookedup.AsyncList(pre_add=self.abort_odd, post_add=self.slow_post_add,
+                               max_concurrency=3)
+        await L.aextend(range(20))
+        self.assertTrue(L == list(range(0, 20, 2)))
+        self.assertTrue(sorted(self.added) == list(L))
+        self.assertTrue(self.most_running == 3)
+        self.assertTrue(L._abort_stats['pre_add'] == 10)
+
+    async def test_slices(self):
+        removed = []
+        L = hookedup.AsyncList(range(8), pre_remove=self.abort_odd, pre_replace=self.abort_odd,
+                               post_remove=lambda L, item: removed.append(item))
+        await L.asetitem(slice(1, 6), [10, 11])
+        self.assertTrue(L == [0, 1, 11, 3, 5, 6, 7] and removed == [4])
+        await L.adelitem(slice(None, None, -2))
+        self.assertTrue(L == [1, 11, 3, 5, 6, 7] and removed == [4, 0])
+        await L.aclear()
+        self.assertTrue(L == [1, 11, 3, 5, 7] and removed == [4, 0, 6])
+
+    async def test_hook_stats_record_async_hooks(self):
+        L = hookedup.AsyncList(pre_add=self.abort_odd, post_add=self.slow_post_add)
+        stats = L.enable_hook_stats()
+        await L.aextend(range(4))
+        await L.aappend(5)
+        snapshot = stats.snapshot()
+        self.assertTrue(sorted(snapshot) == ['post_add', 'pre_add'])
+        self.assertTrue(snapshot['pre_add']['calls'] == 5 and snapshot['pre_add']['aborts'] == 3)
+        self.assertTrue(snapshot['post_add']['calls'] == 2)
+        self.assertTrue(snapshot['post_add']['total_seconds'] >= 0.002)
+        shared = hookedup.enable_hook_stats()
+        try:
+            L = hookedup.AsyncList(post_add=self.slow_post_add)
+        finally:
+            hookedup.disable_hook_stats()
+        await L.aappend(1)
+        self.assertTrue(list(shared.snapshot()) == ['post_add'])
+        self.assertTrue(shared.snapshot()['post_add']['calls'] == 1)
+
+    async def test_sync_mutators_with_hooks_raise(self):
+        L = hookedup.AsyncList([1], post_add=self.slow_post_add)
+        self.assertRaises(TypeError, L.append, 2)
+        self.assertRaises(TypeError, L.extend, [2])
+        L.pop()  # removals have no hooks
+        self.assertTrue(L == [] and self.added == [])
+
+
+class TestThreadSafeList(unittest.TestCase):
+    """ verify that ThreadSafeList keeps hooks and contents consistent under concurrent use, and
+    that post hooks offloaded to an executor run (in order, if requested) and report errors
+    """
+
+    def test_concurrent_moves_in_opposite_directions(self):
+        a = hookedup.ThreadSafeList(range(1000), pre_move=lambda *_: None)
+        b = hookedup.ThreadSafeList(range(1000, 2000), pre_move=lambda *_: None)
+        def shuffle(src, dst):
+            for _ in range(1000):
+                src.move_to(dst, 0)
+        threads = [threading.Thread(target=shuffle, args=pair) for pair in ((a, b), (b, a))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertTrue(sorted(a + b) == list(range(2000)))
+
+    def test_move_from_plain_list_holds_destination_lock(self):
+        held = []
+        record = lambda L, item: held.append(L._mutation_lock._is_owned())
+        dst = hookedup.ThreadSafeList(pre_add=record)
+        hookedup.List([1, 2]).move_to(dst, 0)
+        self.assertTrue(dst == [1] and held == [True])
+
+    def test_concurrent_appends_and_pops(self):
+        added = []
+        removed = []
+        L = hookedup.ThreadSafeList(pre_add=lambda L, item: item % 5 == 0 and self.raise_abort(),
+                                    post_add=lambda L, item: added.append(item),
+                                    post_remove=lambda L, item: removed.append(item))
+        def work(offset):
+            for i in range(offset, offset + 2000):
+                L.append(i)
+                if i % 3 == 0:
+                    try:
+                        L.pop()
+                    except IndexError:
+                        pass  # other threads emptied the list
+        threads = [threading.Thread(target=work, args=(n * 2000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(len(added) == 4 * 2000 * 4 // 5)
+        self.assertTrue(collections.Counter(L) + collections.Counter(removed) ==
+                        collections.Counter(added))
+
+    def raise_abort(self, *_):
+        raise hookedup.Abort()
+
+    def test_ordered_post_hooks_on_executor(self):
+        seen = []
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            L = hookedup.ThreadSafeList(post_add=lambda L, item: seen.append(item),
+                                        executor=executor, ordered=True)
+            for i in range(500):
+                L.append(i)
+            L.wait_post_hooks()
+            self.assertTrue(seen == list(range(500)))
+
+    def test_unordered_post_hooks_report_errors(self):
+        seen = []
+        def post_add(L, item):
+            if item == 3:
+                raise KeyError(item)
+            seen.append(item)
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            L = hookedup.ThreadSafeList(post_add=post_add, executor=executor, ordered=False)
+            L.extend(range(10))
+            self.assertRaises(KeyError, L.wait_post_hooks)
+            L.wait_post_hooks()  # errors are reported once
+        self.assertTrue(sorted(seen) == [0, 1, 2, 4, 5, 6, 7, 8, 9])
+
+    def test_failed_submit_does_not_block_later_post_hooks(self):
+        seen, failing = [], [True]
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            submit = executor.submit
+            executor.submit = lambda *args: self.raise_shutdown() if failing else submit(*args)
+            L = hookedup.ThreadSafeList(post_add=lambda L, item: seen.append(item),
+                                        executor=executor, ordered=True)
+            self.assertRaises(RuntimeError, L.append, 0)
+            L.wait_post_hooks(timeout=5)
+            failing.clear()
+            L.extend(range(1, 4))
+            L.wait_post_hooks(timeout=5)
+        self.assertTrue(seen == [1, 2, 3] and L == [0, 1, 2, 3])
+
+    def raise_shutdown(self):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+    def test_transaction_defers_offloaded_post_hooks(self):
+        seen = []
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            L = hookedup.ThreadSafeList(post_add=lambda L, item: seen.append(item),
+                                        executor=executor)
+            with L.transaction():
+                L.extend([1, 2])
+                raise hookedup.Abort()
+            with L.transaction():
+                L.extend([3, 4])
+            L.wait_post_hooks()
+        self.assertTrue(L == [3, 4] and seen == [3, 4])
+
+
+class TestIndexedList(unittest.TestCase):
+    """ verify that an indexed hookedup.List answers like a list after every kind of mutation """
+
+    def assertIndexMatches(self, L, expected):
+        self.assertTrue(L == expected)
+        counts = collections.Counter(x for x in expected if isinstance(x, collections.abc.Hashable))
+        self.assertTrue(L._index.counts == dict(counts))
+        for x in set(range(-3, 12)):
+            self.assertTrue((x in L) == (x in expected))
+            self.assertTrue(L.count(x) == expected.count(x))
+
+    def test_indexed_keyword_returns_indexed_list(self):
+        L = hookedup.List(range(3), indexed=True)
+        self.assertTrue(isinstance(L, hookedup.IndexedList))
+        self.assertTrue(isinstance(L, hookedup.List))
+        self.assertFalse(isinstance(hookedup.List(range(3)), hookedup.IndexedList))
+
+    def test_index_follows_mutations(self):
+        operations = [lambda l: l.append(1), lambda l: l.extend([2, 2, 5]),
+                      lambda l: l.insert(-2, 7), lambda l: l.pop(), lambda l: l.pop(0),
+                      lambda l: l.remove(2), lambda l: l.__setitem__(0, 9),
+                      lambda l: l.__setitem__(slice(1, 3), [4, 4, 4]),
+                      lambda l: l.__delitem__(slice(None, None, 2)), lambda l: l.__iadd__([3]),
+                      lambda l: l.__imul__(3), lambda l: l.__setitem__(slice(None, None, -1),
+                                                                        list(range(len(l)))),
+                      lambda l: l.__delitem__(-1), lambda l: l.clear()]
+        L = hookedup.List(range(6), indexed=True)
+        expected = list(range(6))
+        for operation in operations:
+            operation(L)
+            operation(expected)
+            self.assertIndexMatches(L, expected)
+
+    def test_aborted_changes_leave_index_unchanged(self):
+        keep_even = lambda L, item, *_: item % 2 == 0 and self.raise_abort()
+        L = hookedup.List(range(10), indexed=True, pre_remove=keep_even, pre_replace=keep_even)
+        L.clear()
+        self.assertIndexMatches(L, [0, 2, 4, 6, 8])
+        L.set_hooks(pre_remove=None)
+        L[:] = [1, 1]
+        self.assertIndexMatches(L, [0, 2])
+
+    def raise_abort(self, *_):
+        raise hookedup.Abort()
+
+    def test_absent_items_raise_like_list(self):
+        L = hookedup.List(range(3), indexed=True)
+        self.assertRaises(ValueError, L.remove, 5)
+        self.assertRaises(ValueError, L.index, 5)
+        self.assertTrue(L.index(2) == 2)
+
+    def test_unhashable_items_fall_back_to_scanning(self):
+        L = hookedup.List([[1], 2], indexed=True)
+        self.assertTrue([1] in L and 2 in L and [3] not in L)
+        self.assertTrue(L.count([1]) == 1)
+        L.remove([1])
+        self.assertTrue(L == [2] and L._index.unhashable == 0)
+
+
+class TestHookedSet(unittest.TestCase):
+    """ verify that hookedup.Set calls add and remove hooks only for real membership changes """
+
+    def setUp(self):
+        self.calls = []
+        record = lambda name: lambda S, item: self.calls.append((name, item))
+        self.S = hookedup.Set([1, 2, 3], pre_add=record('pre_add'), post_add=record('post_add'),
+                              pre_remove=record('pre_remove'), post_remove=record('post_remove'))
+
+    def test_single_member_operations(self):
+        S = self.S
+        S.add(2)
+        S.discard(7)
+        self.assertTrue(self.calls == [])
+        S.add(4)
+        S.remove(1)
+        S.discard(2)
+        self.assertTrue(S == {3, 4})
+        self.assertTrue(self.calls == [('pre_add', 4), ('post_add', 4), ('pre_remove', 1),
+                                       ('post_remove', 1), ('pre_remove', 2), ('post_remove', 2)])
+        self.assertRaises(KeyError, S.remove, 9)
+        item = S.pop()
+        self.assertTrue(item in (3, 4) and item not in S)
+        S.clear()
+        self.assertRaises(KeyError, S.pop)
+
+    def test_bulk_operations_call_all_pre_hooks_first(self):
+        S = self.S
+        S |= {3, 4, 5}
+        self.assertTrue(S == {1, 2, 3, 4, 5})
+        self.assertTrue(self.calls == [('pre_add', 4), ('pre_add', 5), ('post_add', 4),
+                                       ('post_add', 5)])
+        del self.calls[:]
+        S -= {1, 9}
+        S &= {2, 3, 4}
+        S ^= {4, 6}
+        self.assertTrue(S == {2, 3, 6})
+        self.assertTrue(self.calls == [('pre_remove', 1), ('post_remove', 1), ('pre_remove', 5),
+                                       ('post_remove', 5), ('pre_remove', 4), ('pre_add', 6),
+                                       ('post_remove', 4), ('post_add', 6)])
+
+    def test_abort_keeps_member_unchanged(self):
+        def keep_odd(S, item):
+            if item % 2:
+                raise hookedup.Abort()
+        S = hookedup.Set(range(6), pre_add=keep_odd, pre_remove=keep_odd)
+        S.update(range(10))
+        self.assertTrue(S == {0, 1, 2, 3, 4, 5, 6, 8})
+        S.clear()
+        S.discard(3)
+        self.assertTrue(S == {1, 3, 5})
+        S.set_hooks(pre_add_many=lambda S, items: [i for i in items if i < 8], pre_remove=None)
+        S.update(range(10))
+        self.assertTrue(S == set(range(8)))
+        with self.assertWarns(UserWarning):
+            S.set_hooks(pre_replace=keep_odd)
+
+
+class TestHookedDict(unittest.TestCase):
+    """ verify that hookedup.Dict calls add, remove and replace hooks with keys and values """
+
+    def setUp(self):
+        self.calls = []
+        record = lambda name: lambda D, *args: self.calls.append((name,) + args)
+        self.D = hookedup.Dict({'a': 1}, **{name: record(name) for name in
+                                            ('pre_add', 'post_add', 'pre_remove', 'post_remove',
+                                             'pre_replace', 'post_replace')})
+
+    def test_item_operations(self):
+        D = self.D
+        D['b'] = 2
+        D['a'] = 3
+        del D['b']
+        self.assertTrue(D.setdefault('a', 0) == 3 and D.setdefault('c', 4) == 4)
+        self.assertTrue(D.pop('c') == 4 and D.pop('x', None) is None)
+        self.assertTrue(D.popitem() == ('a', 3) and D == {})
+        self.assertRaises(KeyError, D.popitem)
+        self.assertRaises(KeyError, D.__delitem__, 'x')
+        self.assertTrue(self.calls == [('pre_add', 'b', 2), ('post_add', 'b', 2),
+                                       ('pre_replace', 'a', 1, 3), ('post_replace', 'a', 1, 3),
+                                       ('pre_remove', 'b', 2), ('post_remove', 'b', 2),
+                                       ('pre_add', 'c', 4), ('post_add', 'c', 4),
+                                       ('pre_remove', 'c', 4), ('post_remove', 'c', 4),
+                                       ('pre_remove', 'a', 3), ('post_remove', 'a', 3)])
+
+    def test_update_calls_all_pre_hooks_first(self):
+        D = self.D
+        D.update({'a': 2}, b=3)
+        D |= [('c', 4)]
+        self.assertTrue(D == {'a': 2, 'b': 3, 'c': 4})
+        self.assertTrue(self.calls == [('pre_replace', 'a', 1, 2), ('pre_add', 'b', 3),
+                                       ('post_replace', 'a', 1, 2), ('post_add', 'b', 3),
+                                       ('pre_add', 'c', 4), ('post_add', 'c', 4)])
+        del self.calls[:]
+        D.clear()
+        self.assertTrue(D == {} and len(self.calls) == 6)
+
+    def test_abort_keeps_key_unchanged(self):
+        def keep_a(D, key, *_):
+            if key == 'a':
+                raise hookedup.Abort()
+        D = hookedup.Dict({'a': 1, 'b': 2}, pre_add=keep_a, pre_remove=keep_a, pre_replace=keep_a)
+        D['a'] = 5
+        D.update(a=6, b=7)
+        self.assertTrue(D.pop('a') == 1)
+        D.clear()
+        self.assertTrue(D == {'a': 1})
+        D.set_hooks(pre_add=None, pre_add_many=lambda D, pairs: pairs[:1])
+        D.update([('x', 1), ('y', 2)])
+        self.assertTrue(D == {'a': 1, 'x': 1})
+
+
+class TestHookedArray(unittest.TestCase):
+    """ verify that hookedup.Array validates bulk adds with one batch hook call, and calls the
+    single-item hooks like List
+    """
+
+    def test_bulk_add_calls_batch_hook_once_with_buffer(self):
+        views = []
+        def non_negative(A, view):
+            views.append(view)
+            return [x >= 0 for x in view]
+        added = []
+        A = hookedup.Array('d', [0.5], pre_add_many=non_negative,
+                           post_add_many=lambda A, view: added.append(view.tolist()))
+        A.extend([1, -2, 3])
+        A += array.array('d', [-1.5, 2.5])
+        A.fromlist([4.0])
+        self.assertTrue(A.tolist() == [0.5, 1, 3, 2.5, 4])
+        self.assertTrue([len(view) for view in views] == [3, 2, 1] and views[0].readonly)
+        self.assertTrue(added == [[1, 3], [2.5], [4]])
+        self.assertRaises(TypeError, A.extend, array.array('i', [1]))
+        self.assertRaises(TypeError, A.__iadd__, [1])
+        A.set_hooks(pre_add_many=lambda A, view: 2)
+        A.frombytes(array.array('d', [7, 8, 9]).tobytes())
+        self.assertTrue(A.tolist()[-2:] == [7, 8])
+        A.set_hooks(pre_add_many=lambda A, view: [True])
+        self.assertRaises(ValueError, A.extend, [1, 2])
+        A.set_hooks(pre_add_many=lambda A, view: all(x >= 0 for x in view))
+        A.extend([5, 6])
+        A.extend([5, -6])  # False accepts none
+        self.assertTrue(A.tolist()[-3:] == [8, 5, 6])
+        A.set_hooks(pre_add_many=lambda A, view: 2.5)
+        self.assertRaises(TypeError, A.extend, [1, 2])
+
+    def test_single_item_hooks_and_aborts(self):
+        def keep_odd(A, item, *_):
+            if item % 2:
+                raise hookedup.Abort()
+        removed = []
+        A = hookedup.Array('i', range(6), pre_add=keep_odd, pre_remove=keep_odd,
+                           pre_replace=keep_odd, post_remove=lambda A, item: removed.append(item))
+        A.append(7)
+        A.append(8)
+        A.insert(0, 9)
+        A.extend(range(10, 13))
+        self.assertTrue(A.tolist() == [0, 1, 2, 3, 4, 5, 8, 10, 12])
+        self.assertTrue(A.pop(1) == 1 and A.pop(0) == 0)
+        A.remove(2)
+        del A[::2]
+        self.assertTrue(A.tolist() == [1, 3, 5, 10])
+        self.assertTrue(removed == [0, 2, 4, 8, 12])
+        A[3] = 11
+        A[0] = 0
+        A[1:3] = array.array('i', [20])  # 3 and 5 are odd: neither replaced nor removed
+        self.assertTrue(A.tolist() == [1, 3, 5, 11])
+        self.assertRaises(TypeError, A.append, 1.5)
+        self.assertRaises(TypeError, A.__setitem__, slice(0, 1), [1])
+        A.set_hooks(pre_add=None, pre_remove=None, pre_replace=None)
+        A[1:3] = array.array('i', [20])
+        A *= 2
+        self.assertTrue(A.tolist() == [1, 20, 11] * 2 and type(A) == hookedup.Array)
+
+    def test_index_errors_match_array(self):
+        hooks = dict.fromkeys(('pre_remove', 'pre_replace'), lambda A, *_: None)
+        for items, operation in (([1, 2], lambda A: A.pop(5)), ([], lambda A: A.pop()),
+                                 ([1, 2], lambda A: A.__delitem__(5)),
+                                 ([1, 2], lambda A: A.__setitem__(-3, 1))):
+            native, hooked = array.array('i', items), hookedup.Array('i', items, **hooks)
+            with self.subTest(items=items):
+                with self.assertRaises(IndexError) as expected:
+                    operation(native)
+                with self.assertRaises(IndexError) as raised:
+                    operation(hooked)
+                self.assertEqual(str(raised.exception), str(expected.exception))
+
+
+
+
+
+
+
+@hookedup.pure
+def reject_multiples_of_3(lst, item):
+    """ importable pure pre_add hook for parallel validation """
+    return hookedup.ABORT if item % 3 == 0 else None
+
+
+def accept_all(container, items):
+    """ importable batch hook, so that containers using it can be pickled """
+    return None
+
+
+class TestPickle(unittest.TestCase):
+    """ verify that hooked containers survive pickling, copying and transfer to another process
+    with their items and hooks, and that hooks which cannot be pickled by name are reported
+    """
+
+    def assertSameContainer(self, original, restored):
+        self.assertTrue(type(restored) is type(original) and restored == original)
+        self.assertTrue(restored._installed_hooks() == original._installed_hooks())
+
+    def test_round_trip_keeps_items_and_hooks(self):
+        L = hookedup.List([1, 'a'], pre_add=operator.is_, post_remove=operator.is_not)
+        L.append(L)
+        containers = [hookedup.List(range(3), indexed=True, pre_remove=operator.is_),
+                      hookedup.AsyncList([2], max_concurrency=3, pre_add=operator.is_),
+                      hookedup.ThreadSafeList([3], post_add=operator.is_),
+                      hookedup.Set({1, 2}, pre_add=operator.is_),
+                      hookedup.Dict({'a': 1}, pre_replace=operator.is_),
+                      hookedup.Array('d', [0.5, 2], pre_add_many=accept_all)]
+        for protocol in (2, pickle.HIGHEST_PROTOCOL):
+            restored = pickle.loads(pickle.dumps(L, protocol))
+            self.assertTrue(restored[:2] == [1, 'a'] and restored[2] is restored)
+            self.assertTrue(restored._installed_hooks() == L._installed_hooks())
+            for container in containers:
+                self.assertSameContainer(container, pickle.loads(pickle.dumps(container, protocol)))
+        for container in containers:
+            self.assertSameContainer(container, copy.copy(container))
+            self.assertSameContainer(container, copy.deepcopy(container))
+        self.assertTrue(2 in pickle.loads(pickle.dumps(containers[0]))._index.counts)
+        self.assertTrue(pickle.loads(pickle.dumps(containers[1])).max_concurrency == 3)
+        self.assertTrue(pickle.loads(pickle.dumps(hookedup.ABORT)) is hookedup.ABORT)
+
+    def test_hooks_must_be_importable(self):
+        with self.assertRaises(pickle.PicklingError):
+            pickle.dumps(hookedup.List(pre_add=lambda L, item: None))
+        def local_hook(L, item):
+            pass
+        with self.assertRaises(pickle.PicklingError):
+            pickle.dumps(hookedup.Set(post_add=local_hook))
+
+    def test_array_uses_out_of_band_buffer(self):
+        A = hookedup.Array('d', range(10 ** 6), pre_add=operator.is_)
+        buffers = []
+        data = pickle.dumps(A, protocol=5, buffer_callback=buffers.append)
+        self.assertTrue(len(data) < 1000 and len(buffers) == 1)
+        self.assertSameContainer(A, pickle.loads(data, buffers=buffers))
+
+    def test_process_pool_transfer_of_million_items(self):
+        L = hookedup.List(range(10 ** 6), pre_add=operator.is_)
+        A = hookedup.Array('d', range(10 ** 6), pre_add_many=accept_all)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+            # operator.iadd(container, empty) hands the container back after a hooked extend
+            list_back = pool.submit(operator.iadd, L, []).result(60)
+            array_back = pool.submit(operator.iadd, A, array.array('d')).result(60)
+        self.assertSameContainer(L, list_back)
+        self.assertSameContainer(A, array_back)
+
+
+class TestParallelValidation(unittest.TestCase):
+    """ verify that bulk adds validate with a pure pre_add hook in pool workers, then commit and
+    call post_add in the original order
+    """
+
+    def check_parallel_extend(self, executor):
+        added = []
+        L = hookedup.List([-1], pre_add=reject_multiples_of_3,
+                          post_add=lambda L, item: added.append(item))
+        L.validate_in_parallel(executor, chunk_size=1000)
+        L.extend(range(10000))
+        L[1:1] = range(10000, 13000)
+        L += range(5)  # too few items for the pool: validated serially, with L as the list
+        expected = [i for i in range(10000, 13000) if i % 3] + [i for i in range(10000) if i % 3]
+        self.assertTrue(L[1:-3] == expected and L[-3:] == [1, 2, 4])
+        self.assertTrue(added == [i for i in range(10000) if i % 3] +
+                        [i for i in range(10000, 13000) if i % 3] + [1, 2, 4])
+        self.assertTrue(L._abort_stats['pre_add'] == 3334 + 1000 + 2)
+
+    def test_thread_pool(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            self.check_parallel_extend(pool)
+            lists = set()
+            L = hookedup.List(pre_add=hookedup.pure(lambda lst, item: lists.add(lst)))
+            L.validate_in_parallel(pool, chunk_size=10)
+            L.extend(range(100))
+            self.assertTrue(lists == {None} and L == list(range(100)))
+
+    def test_process_pool(self):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+            self.check_parallel_extend(pool)
+
+    def test_impure_hooks_stay_serial(self):
+        seen = []
+        L = hookedup.List(pre_add=lambda L, item: seen.append(L))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            L.validate_in_parallel(pool, chunk_size=1)
+            L.extend(range(3))
+        L.validate_in_parallel(None)
+        self.assertTrue(L == [0, 1, 2] and all(lst is L for lst in seen))
+
+
+class TestPreventOverwriteProperty(unittest.TestCase):
+    """ verify that each owner gets its own persistent List that cannot be overwritten, and that
+    the list is reclaimed along with its owner
+    """
+
+    class Owner:
+        members = hookedup.PreventOverwriteProperty([0], pre_add=lambda L, item: None)
+        legacy = property(hookedup.PreventOverwriteProperty.setup([1]))
+
+    class SlottedOwner:
+        __slots__ = ('__weakref__',)
+        members = hookedup.PreventOverwriteProperty()
+
+    def test_each_owner_gets_same_list(self):
+        a, b = self.Owner(), self.Owner()
+        self.assertTrue(a.members is a.members and a.legacy is a.legacy)
+        self.assertTrue(a.members is not b.members)
+        self.assertTrue(a.members == [0] and a.legacy == [1])
+        self.assertTrue(isinstance(a.members, hookedup.List))
+        s = self.SlottedOwner()
+        s.members.append(3)
+        self.assertTrue(s.members == [3])
+
+    def test_overwrite_prohibited(self):
+        a = self.Owner()
+        a.members += [1]
+        a.members *= 2
+        self.assertTrue(a.members == [0, 1, 0, 1])
+        with self.assertRaises(AttributeError):
+            a.members = []
+        with self.assertRaises(AttributeError):
+            a.legacy = []
+
+    def test_owners_are_reclaimed(self):
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        for i in range(100000):
+            self.Owner().members.append(i)
+            self.SlottedOwner().members.append(i)
+        gc.collect()
+        self.assertTrue(sys.getallocatedblocks() - blocks < 1000)
+        self.assertTrue(len(self.SlottedOwner.members._slotted_owners) == 0)
+
+    def test_container_keyword(self):
+        class Owner:
+            tags = hookedup.PreventOverwriteProperty(container=hookedup.Set)
+            scores = hookedup.PreventOverwriteProperty({'a': 1}, container=hookedup.Dict)
+        a = Owner()
+        a.tags |= {1}
+        self.assertTrue(isinstance(a.tags, hookedup.Set) and a.tags == {1})
+        self.assertTrue(isinstance(a.scores, hookedup.Dict) and a.scores is a.scores)
+        self.assertRaises(AttributeError, setattr, a, 'scores', {})
+
+
+class TestPreventHookedupOverwriteReset(unittest.TestCase):
+    """ verify that attributes holding a hookedup List cannot be overwritten, while all other
+    attributes can be assigned freely
+    """
+
+    class Guarded(hookedup.PreventHookedupOverwriteReset):
+        shared = hookedup.List()
 
+    def test_list_attribute_cannot_be_overwritten(self):
+        a = self.Guarded()
+        a.counter = 0
+        a.counter += 1
+        a.members = hookedup.List([1])
+        a.members += [2]
+        a.members *= 2
+        self.assertTrue(a.members == [1, 2, 1, 2] and a.counter == 1)
+        self.assertRaises(AttributeError, setattr, a, 'members', [])
+        self.assertRaises(AttributeError, setattr, a, 'members', hookedup.List())
+        self.assertRaises(AttributeError, setattr, a, 'shared', [])
 
+    def test_set_and_dict_attributes_cannot_be_overwritten(self):
+        a = self.Guarded()
+        a.tags = hookedup.Set()
+        a.tags |= {1}
+        a.scores = hookedup.Dict()
+        a.scores |= {'a': 1}
+        self.assertRaises(AttributeError, setattr, a, 'tags', set())
+        self.assertRaises(AttributeError, setattr, a, 'scores', {})
 
+    def test_checked_names_are_tracked_per_class(self):
+        class Base(hookedup.PreventHookedupOverwriteReset):
+            shared = hookedup.List()
+        class Other(Base):
+            pass
+        b = Other()
+        b.members = []
+        b.members = hookedup.List()
+        self.assertRaises(AttributeError, setattr, b, 'members', [])
+        self.assertTrue('members' in Other._hookedup_attr_names)
+        self.assertTrue('shared' in Other._hookedup_attr_names)
+        self.assertFalse('members' in Base._hookedup_attr_names)
 
+    def test_class_attribute_assigned_later_is_checked(self):
+        class Base(hookedup.PreventHookedupOverwriteReset):
+            pass
+        class Derived(Base):
+            pass
+        Base.members = hookedup.List()
+        self.assertRaises(AttributeError, setattr, Base(), 'members', [])
+        self.assertRaises(AttributeError, setattr, Derived(), 'members', [])
 
+    def test_combines_with_abc(self):
+        class Abstract(hookedup.PreventHookedupOverwriteReset, abc.ABC):
+            members = hookedup.List()
+        self.assertRaises(AttributeError, setattr, Abstract(), 'members', [])
 
 
 unittest.main()